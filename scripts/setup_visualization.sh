@@ -29,7 +29,7 @@ echo ""
 
 # Run test script
 echo "Running test script to verify setup..."
-python3 test_visualization_feature.py
+python3 -m tests.unit.visualization.test_visualization_feature
 echo ""
 
 echo "=== Setup Complete ==="
@@ -3,6 +3,7 @@ API endpoints for the database models.
 """
 
 import logging
+import pymongo
 from flask import Blueprint, request, jsonify
 from typing import Dict, List, Any, Optional
 
@@ -27,6 +28,14 @@ db_api = Blueprint('db_api', __name__)
 
 # Initialize models
 db_manager = DatabaseManager()
+
+# Create the collection indexes once at startup; ComplexQueries relies on
+# the field value index when it hints template-filtered lookups
+try:
+    db_manager.create_indexes()
+except pymongo.errors.PyMongoError as e:
+    logger.error(f"Error creating database indexes: {e}")
+
 template_model = TemplateModel(db_manager)
 filled_form_model = FilledFormModel(db_manager)
 complex_queries = ComplexQueries(db_manager)
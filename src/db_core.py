@@ -14,6 +14,14 @@ from src.config import MONGODB_URI, MONGODB_DB
 
 logger = logging.getLogger(__name__)
 
+# Compound index used to look up filled forms by template and field value
+FIELD_VALUE_INDEX_NAME = "fv_template_key_value"
+FIELD_VALUE_INDEX_KEYS = [
+    ("template_id", pymongo.ASCENDING),
+    ("field_values.key", pymongo.ASCENDING),
+    ("field_values.value", pymongo.ASCENDING)
+]
+
 
 class DatabaseManager:
     """Database manager for MongoDB operations."""
@@ -115,6 +123,7 @@ class DatabaseManager:
         forms_coll.create_index("template_id")
         forms_coll.create_index("status")
         forms_coll.create_index("created_at")
+        forms_coll.create_index(FIELD_VALUE_INDEX_KEYS, name=FIELD_VALUE_INDEX_NAME)
         
         logger.info("Created database indexes")
     
@@ -9,13 +9,16 @@ from typing import Dict, List, Any, Optional, Union
 import pymongo
 from bson import ObjectId
 
-from src.db_core import DatabaseManager
+from src.db_core import DatabaseManager, FIELD_VALUE_INDEX_NAME
 from src.db_models import TemplateModel, FilledFormModel
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Large fields left out of template listings; fetch the template for these
+TEMPLATE_SUMMARY_EXCLUDE_FIELDS = ["document_data"]
+
 class QueryBuilder:
     """Utility class for building MongoDB queries."""
     
@@ -116,6 +119,40 @@ class ComplexQueries:
         self.template_model = TemplateModel(db_manager)
         self.form_model = FilledFormModel(db_manager)
     
+    def _find_projected(
+        self,
+        collection,
+        query: Dict[str, Any],
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Run a find query with the field projection applied by the server.
+        
+        Args:
+            collection: The collection to query
+            query: The query filter
+            include: Fields to return (takes precedence over exclude)
+            exclude: Fields to leave out
+            skip: Number of results to skip
+            limit: Maximum number of results to return (0 for no limit)
+            
+        Returns:
+            List of matching documents
+        """
+        projection = None
+        if include:
+            projection = {field: 1 for field in include}
+        elif exclude:
+            projection = {field: 0 for field in exclude}
+        
+        cursor = collection.find(query, projection)
+        if skip or limit:
+            cursor = cursor.skip(skip).limit(limit)
+        
+        return list(cursor)
+    
     def get_template_with_filled_forms(self, template_id: str) -> Optional[Dict[str, Any]]:
         """Get a template with all its filled forms.
         
@@ -155,7 +192,7 @@ class ComplexQueries:
             limit: Maximum number of results to return
             
         Returns:
-            List of matching templates
+            List of matching templates, without their document data
         """
         # Build query
         query = {}
@@ -167,9 +204,13 @@ class ComplexQueries:
             query["tags"] = {"$all": tags}
         
         # Execute search
-        results = self.templates_collection.find(query).skip(skip).limit(limit)
-        
-        return list(results)
+        return self._find_projected(
+            self.templates_collection,
+            query,
+            exclude=TEMPLATE_SUMMARY_EXCLUDE_FIELDS,
+            skip=skip,
+            limit=limit
+        )
     
     def get_form_statistics(self, template_id: Optional[str] = None) -> Dict[str, Any]:
         """Get statistics about forms.
@@ -185,19 +226,14 @@ class ComplexQueries:
         if template_id:
             match_stage["template_id"] = template_id
         
-        # Build aggregation pipeline
+        # Build aggregation pipeline, matching first so the template_id index applies
         pipeline = [
             {"$match": match_stage},
-            {
-                "$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1}
-                }
-            }
+            {"$sortByCount": "$status"}
         ]
         
         # Execute aggregation
-        results = list(self.forms_collection.aggregate(pipeline))
+        results = list(self.forms_collection.aggregate(pipeline, allowDiskUse=False))
         
         # Format results
         stats = {
@@ -217,10 +253,20 @@ class ComplexQueries:
             limit: Maximum number of results to return
             
         Returns:
-            List of templates with form counts
+            List of templates with form counts, without their document data
         """
-        # Get templates first
-        templates = self.template_model.list(skip=skip, limit=limit)
+        # Get templates first, handling errors like TemplateModel.list
+        try:
+            templates = self._find_projected(
+                self.templates_collection,
+                {},
+                exclude=TEMPLATE_SUMMARY_EXCLUDE_FIELDS,
+                skip=skip,
+                limit=limit
+            )
+        except Exception as e:
+            logger.error(f"Error listing templates: {e}")
+            return []
         
         # For each template, get the count of forms
         for template in templates:
@@ -256,20 +302,23 @@ class ComplexQueries:
         Returns:
             List of matching forms
         """
-        # Build query
-        query = {
-            "field_values": {
-                "$elemMatch": {
-                    "key": field_key,
-                    "value": field_value
-                }
-            }
-        }
+        # Build query, with template_id first to match the index prefix
+        query = {}
         
         if template_id:
             query["template_id"] = template_id
         
+        query["field_values"] = {
+            "$elemMatch": {
+                "key": field_key,
+                "value": field_value
+            }
+        }
+        
         # Execute query
         results = self.forms_collection.find(query)
+        if template_id:
+            # The index is created at startup by DatabaseManager.create_indexes
+            results = results.hint(FIELD_VALUE_INDEX_NAME)
         
-        return list(results) 
\ No newline at end of file
+        return list(results)
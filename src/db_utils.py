@@ -4,26 +4,85 @@ Helper functions and utilities for database operations.
 
 import logging
 import json
-from typing import Dict, List, Any, Optional, Union, Tuple
+import re
+import functools
+import operator
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterable, Iterator
 import datetime
 import uuid
 from bson import ObjectId
 
 import pymongo
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Types that serialize_mongo_doc copies through unchanged
+_PASSTHROUGH_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# Cheap prefilters run before the slower ObjectId/ISO date parsers
+_OBJECT_ID_RE = re.compile(r"[0-9a-fA-F]{24}")
+_ISO_DATE_PREFIX_RE = re.compile(r"\d{4}")
+
+
+def _mongo_default(obj: Any) -> str:
+    """
+    Convert MongoDB-specific types that JSON can't represent natively.
+    
+    Args:
+        obj: Object the JSON encoder couldn't handle
+        
+    Returns:
+        JSON-compatible string
+    """
+    if isinstance(obj, (ObjectId, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        # Covers datetime, which subclasses date
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class MongoJSONEncoder(json.JSONEncoder):
     """JSON encoder that can handle MongoDB-specific types."""
     
     def default(self, obj):
-        if isinstance(obj, ObjectId):
-            return str(obj)
-        if isinstance(obj, datetime.datetime):
-            return obj.isoformat()
-        return super().default(obj)
+        return _mongo_default(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object containing MongoDB types as compact JSON bytes.
+    
+    Uses orjson when it is installed and falls back to the standard
+    library encoder otherwise. Both backends use compact separators and
+    encode dates, times, ObjectIds and UUIDs the same way. They differ
+    on edge cases: orjson rejects integers wider than 64 bits and writes
+    NaN and Infinity as null, which the standard library accepts and
+    writes as NaN and Infinity.
+    
+    Args:
+        obj: Object to encode
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_mongo_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    
+    return json.dumps(
+        obj, cls=MongoJSONEncoder, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
 
 
 def serialize_mongo_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
@@ -43,7 +102,10 @@ def serialize_mongo_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
     
     # Process each field in the document
     for key, value in doc.items():
-        if isinstance(value, ObjectId):
+        # Plain scalars make up most fields and never need conversion
+        if type(value) in _PASSTHROUGH_TYPES:
+            result[key] = value
+        elif isinstance(value, ObjectId):
             result[key] = str(value)
         elif isinstance(value, datetime.datetime):
             result[key] = value.isoformat()
@@ -74,6 +136,23 @@ def serialize_mongo_docs(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [serialize_mongo_doc(doc) for doc in docs]
 
 
+def iter_serialize_mongo_docs(docs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily serialize MongoDB documents to be JSON-compatible.
+    
+    Useful for streaming a cursor without holding every serialized
+    document in memory at once.
+    
+    Args:
+        docs: Iterable of MongoDB documents, such as a cursor
+        
+    Returns:
+        Iterator of JSON-compatible dicts
+    """
+    for doc in docs:
+        yield serialize_mongo_doc(doc)
+
+
 def generate_uuid() -> str:
     """
     Generate a UUID.
@@ -97,10 +176,34 @@ def parse_date_param(date_str: Optional[str]) -> Optional[datetime.datetime]:
     if not date_str:
         return None
     
+    if not isinstance(date_str, str):
+        logger.warning(f"Invalid date format: {date_str} - expected a string")
+        return None
+    
+    result = _parse_iso_datetime(date_str)
+    if result is None:
+        logger.warning(f"Invalid date format: {date_str}")
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_datetime(date_str: str) -> Optional[datetime.datetime]:
+    """
+    Parse an ISO format date string, caching results for repeated values.
+    
+    Args:
+        date_str: Date string in ISO format
+        
+    Returns:
+        Datetime object or None if invalid
+    """
+    # Every ISO format starts with a four digit year
+    if not _ISO_DATE_PREFIX_RE.match(date_str):
+        return None
+    
     try:
         return datetime.datetime.fromisoformat(date_str)
-    except (ValueError, TypeError) as e:
-        logger.warning(f"Invalid date format: {date_str} - {e}")
+    except ValueError:
         return None
 
 
@@ -114,6 +217,9 @@ def validate_object_id(id_str: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
+    if isinstance(id_str, str):
+        return _OBJECT_ID_RE.fullmatch(id_str) is not None
+    
     try:
         return bool(ObjectId.is_valid(id_str))
     except Exception:
@@ -139,14 +245,27 @@ def format_query_results(results: List[Dict[str, Any]],
     
     formatted_results = []
     
+    # Build the field lookups once rather than per result
+    excluded = frozenset(exclude_fields) if exclude_fields else None
+    if include_fields:
+        include_fields = tuple(include_fields)
+        get_included = operator.itemgetter(*include_fields)
+        single_field = len(include_fields) == 1
+    
     for result in results:
         # Apply exclusions first
-        if exclude_fields:
-            result = {k: v for k, v in result.items() if k not in exclude_fields}
+        if excluded:
+            result = {k: v for k, v in result.items() if k not in excluded}
         
         # Then apply inclusions if specified
         if include_fields:
-            result = {k: result.get(k) for k in include_fields if k in result}
+            try:
+                values = get_included(result)
+            except KeyError:
+                # Some fields are missing, so only keep the ones present
+                result = {k: result[k] for k in include_fields if k in result}
+            else:
+                result = dict(zip(include_fields, (values,) if single_field else values))
         
         # Add to results
         formatted_results.append(serialize_mongo_doc(result))
@@ -207,13 +326,29 @@ def build_sort_options(sort_by: Optional[str] = None,
     Returns:
         List of sort tuples
     """
+    # Callers get a fresh list so mutating it can't affect the cache
+    return [_sort_spec(sort_by, sort_order)]
+
+
+@functools.lru_cache(maxsize=256)
+def _sort_spec(sort_by: Optional[str], sort_order: Optional[str]) -> Tuple[str, int]:
+    """
+    Build and cache a single sort tuple.
+    
+    Args:
+        sort_by: Field to sort by
+        sort_order: Sort order ('asc' or 'desc')
+        
+    Returns:
+        Tuple of field name and sort direction
+    """
     if not sort_by:
-        return [("created_at", -1)]  # Default sort
+        return ("created_at", pymongo.DESCENDING)  # Default sort
     
     # Determine sort direction
-    direction = -1 if sort_order and sort_order.lower() == 'desc' else 1
+    direction = pymongo.DESCENDING if sort_order and sort_order.lower() == 'desc' else pymongo.ASCENDING
     
-    return [(sort_by, direction)]
+    return (sort_by, direction)
 
 
 def extract_query_params(params: Dict[str, Any], 
@@ -226,9 +361,11 @@ def extract_query_params(params: Dict[str, Any],
         allowed_params: List of allowed parameter names
         
     Returns:
-        Dict of validated parameters
+        Dict of validated parameters, without any that are None
     """
-    return {k: v for k, v in params.items() if k in allowed_params} 
+    allowed = frozenset(allowed_params)
+    return {k: v for k, v in params.items() if k in allowed and v is not None}
+
 
 
 class DocumentSerializer:
@@ -292,33 +429,34 @@ class DocumentSerializer:
         if not doc:
             return {}
         
-        result = {}
-        
-        for key, value in doc.items():
-            if isinstance(value, str):
-                # Try to convert to ObjectId if it matches the format
-                if ObjectId.is_valid(value) and len(value) == 24:
-                    result[key] = ObjectId(value)
-                else:
-                    # Try to convert to datetime if it's an ISO format
-                    try:
-                        result[key] = datetime.datetime.fromisoformat(value)
-                    except ValueError:
-                        result[key] = value
-            elif isinstance(value, dict):
-                result[key] = DocumentSerializer.deserialize_document(value)
-            elif isinstance(value, list):
-                result[key] = [
-                    DocumentSerializer.deserialize_document(item) if isinstance(item, dict)
-                    else ObjectId(item) if isinstance(item, str) and ObjectId.is_valid(item) and len(item) == 24
-                    else datetime.datetime.fromisoformat(item) if isinstance(item, str) and "T" in item
-                    else item
-                    for item in value
-                ]
-            else:
-                result[key] = value
+        return {key: DocumentSerializer._deserialize_value(value) for key, value in doc.items()}
+    
+    @staticmethod
+    def _deserialize_value(value: Any) -> Any:
+        """Deserialize a single document value.
         
-        return result
+        Args:
+            value: Serialized value
+            
+        Returns:
+            ObjectId or datetime for matching strings, otherwise the value
+            with any nested documents deserialized
+        """
+        if isinstance(value, str):
+            # Cheap regex gates keep most strings away from the parsers
+            if _OBJECT_ID_RE.fullmatch(value):
+                return ObjectId(value)
+            if _ISO_DATE_PREFIX_RE.match(value):
+                try:
+                    return datetime.datetime.fromisoformat(value)
+                except ValueError:
+                    return value
+            return value
+        if isinstance(value, dict):
+            return DocumentSerializer.deserialize_document(value)
+        if isinstance(value, list):
+            return [DocumentSerializer._deserialize_value(item) for item in value]
+        return value
 
 
 class ValidationUtility:
@@ -238,7 +238,7 @@ class TestComplexQueries(unittest.TestCase):
             "name": {"$regex": "Test", "$options": "i"},
             "tags": {"$all": ["test"]}
         }
-        self.mock_templates_collection.find.assert_called_once_with(expected_query)
+        self.mock_templates_collection.find.assert_called_once_with(expected_query, {"document_data": 0})
         mock_cursor.skip.assert_called_once_with(0)
         mock_cursor.limit.assert_called_once_with(10)
 
@@ -259,17 +259,21 @@ class TestComplexQueries(unittest.TestCase):
         self.assertEqual(stats["by_status"]["completed"], 3)
         
         # Verify the collection method was called with correct arguments
-        self.mock_forms_collection.aggregate.assert_called_once()
-        pipeline_arg = self.mock_forms_collection.aggregate.call_args[0][0]
-        self.assertEqual(len(pipeline_arg), 2)
-        self.assertEqual(pipeline_arg[0]["$match"], {"template_id": self.test_template_id})
-        self.assertEqual(pipeline_arg[1]["$group"]["_id"], "$status")
-        self.assertEqual(pipeline_arg[1]["$group"]["count"]["$sum"], 1)
+        self.mock_forms_collection.aggregate.assert_called_once_with(
+            [
+                {"$match": {"template_id": self.test_template_id}},
+                {"$sortByCount": "$status"}
+            ],
+            allowDiskUse=False
+        )
 
     def test_get_templates_with_form_counts(self):
         """Test getting templates with form counts."""
-        # Mock template model list
-        self.mock_template_model.list.return_value = [self.test_template]
+        # Mock templates collection find
+        mock_cursor = MagicMock()
+        mock_cursor.skip.return_value = mock_cursor
+        mock_cursor.limit.return_value = [self.test_template]
+        self.mock_templates_collection.find.return_value = mock_cursor
         
         # Mock forms collection aggregate
         self.mock_forms_collection.aggregate.return_value = [
@@ -284,8 +288,10 @@ class TestComplexQueries(unittest.TestCase):
         self.assertEqual(results[0]["template_id"], self.test_template_id)
         self.assertEqual(results[0]["form_count"], 5)
         
-        # Verify the model and collection methods were called with correct arguments
-        self.mock_template_model.list.assert_called_once_with(skip=0, limit=10)
+        # Verify the collection methods were called with correct arguments
+        self.mock_templates_collection.find.assert_called_once_with({}, {"document_data": 0})
+        mock_cursor.skip.assert_called_once_with(0)
+        mock_cursor.limit.assert_called_once_with(10)
         self.mock_forms_collection.aggregate.assert_called_once()
         pipeline_arg = self.mock_forms_collection.aggregate.call_args[0][0]
         self.assertEqual(len(pipeline_arg), 2)
@@ -295,8 +301,10 @@ class TestComplexQueries(unittest.TestCase):
 
     def test_find_forms_with_field_value(self):
         """Test finding forms with a specific field value."""
-        # Mock forms collection find
-        self.mock_forms_collection.find.return_value = [self.test_form]
+        # Mock forms collection find; the hinted cursor yields the form
+        mock_cursor = MagicMock()
+        mock_cursor.hint.return_value.__iter__.return_value = iter([self.test_form])
+        self.mock_forms_collection.find.return_value = mock_cursor
         
         # Call the method under test
         results = self.complex_queries.find_forms_with_field_value(
@@ -320,6 +328,7 @@ class TestComplexQueries(unittest.TestCase):
             "template_id": self.test_template_id
         }
         self.mock_forms_collection.find.assert_called_once_with(expected_query)
+        mock_cursor.hint.assert_called_once_with("fv_template_key_value")
 
 
 if __name__ == '__main__':
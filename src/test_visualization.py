@@ -140,9 +140,10 @@ class TestVisualization(unittest.TestCase):
         self.assertEqual(len(result["checkboxes"]), 3)
         
         # Check confidence categories
-        checkbox_high = next(cb for cb in result["checkboxes"] if cb["id"] == "cb1")
-        checkbox_medium = next(cb for cb in result["checkboxes"] if cb["id"] == "cb2")
-        checkbox_low = next(cb for cb in result["checkboxes"] if cb["id"] == "cb3")
+        by_id = {cb["id"]: cb for cb in result["checkboxes"]}
+        checkbox_high = by_id["cb1"]
+        checkbox_medium = by_id["cb2"]
+        checkbox_low = by_id["cb3"]
         
         self.assertEqual(checkbox_high["confidence_category"], "high")
         self.assertEqual(checkbox_medium["confidence_category"], "medium")
@@ -155,13 +156,13 @@ class TestVisualization(unittest.TestCase):
         self.assertTrue(mock_draw_instance.text.called)
 
     @patch('src.visualization.os.path.exists')
-    @patch('src.visualization.open', new_callable=mock_open)
-    @patch('src.visualization.json.load')
-    def test_get_checkbox_visualization_data(self, mock_json_load, mock_file, mock_path_exists):
+    @patch('src.visualization.open', new_callable=mock_open, read_data=b'{}')
+    @patch('src.visualization._json_loads')
+    def test_get_checkbox_visualization_data(self, mock_json_loads, mock_file, mock_path_exists):
         """Test getting checkbox visualization data."""
         # Setup mocks
         mock_path_exists.return_value = True
-        mock_json_load.return_value = {
+        mock_json_loads.return_value = {
             "document_name": "test.pdf",
             "checkboxes": self.mock_checkboxes
         }
@@ -174,7 +175,7 @@ class TestVisualization(unittest.TestCase):
         self.assertEqual(len(result["checkboxes"]), 3)
         mock_path_exists.assert_called()
         mock_file.assert_called()
-        mock_json_load.assert_called()
+        mock_json_loads.assert_called_once_with(b'{}')
 
     def test_export_checkbox_data(self):
         """Test exporting checkbox data."""
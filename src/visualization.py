@@ -11,10 +11,29 @@ import logging
 import uuid
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _json_loads(data: bytes) -> Any:
+    """
+    Parse JSON bytes, using orjson when it's installed.
+    
+    Args:
+        data: Raw JSON document
+        
+    Returns:
+        The parsed value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def visualize_template(pdf_path: str, template_data: Dict[str, Any], output_dir: str) -> List[str]:
     """
     Create visualizations of the template fields overlaid on the PDF pages.
@@ -239,8 +258,8 @@ def get_checkbox_visualization_data(visualization_id: str) -> Optional[Dict[str,
             logger.error(f"Visualization metadata not found: {metadata_path}")
             return None
         
-        with open(metadata_path, "r") as f:
-            visualization_data = json.load(f)
+        with open(metadata_path, "rb") as f:
+            visualization_data = _json_loads(f.read())
         
         return visualization_data
         
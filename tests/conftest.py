@@ -0,0 +1,33 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+import os
+
+import pytest
+
+# Set up sys.path once per process (including each xdist worker) rather
+# than in every test module
+from tests import path_setup  # noqa: F401
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Test modules (relative to tests/) that keep their files in pytest temp dirs
+# or unique paths, so they are safe to run in parallel with
+# `pytest -n auto -m parallel_safe`
+PARALLEL_SAFE_MODULES = {
+    "unit/test_db_queries.py",
+    "unit/test_db_utils.py",
+    "unit/test_e2e_checkbox_visualization.py",
+    "unit/test_field_overlay.py",
+    "unit/test_static_paths.py",
+    "unit/test_visualization.py",
+    "unit/visualization/test_visualization_api.py",
+}
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark tests from the parallel-safe modules."""
+    for item in items:
+        module = os.path.relpath(str(item.fspath), TESTS_DIR).replace(os.sep, "/")
+        if module in PARALLEL_SAFE_MODULES:
+            item.add_marker(pytest.mark.parallel_safe)
@@ -0,0 +1,88 @@
+"""
+Lightweight stubs shared by unit tests.
+"""
+from types import SimpleNamespace
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+# Detected checkboxes shared by the visualization tests. Treat as read-only;
+# tests that need to change a checkbox should copy it first.
+SAMPLE_CHECKBOXES = (
+    {
+        "id": "cb1",
+        "label": "Option 1",
+        "value": True,
+        "confidence": 0.95,
+        "page": 1,
+        "bbox": {"left": 0.1, "top": 0.1, "right": 0.2, "bottom": 0.2}
+    },
+    {
+        "id": "cb2",
+        "label": "Option 2",
+        "value": False,
+        "confidence": 0.8,
+        "page": 1,
+        "bbox": {"left": 0.1, "top": 0.3, "right": 0.2, "bottom": 0.4}
+    },
+    {
+        "id": "cb3",
+        "label": "Option 3",
+        "value": True,
+        "confidence": 0.6,
+        "page": 2,
+        "bbox": {"left": 0.1, "top": 0.1, "right": 0.2, "bottom": 0.2}
+    }
+)
+
+
+def db_stub(templates_coll, forms_coll):
+    """
+    Build a minimal stand-in for DatabaseManager
+    
+    Much cheaper to construct than MagicMock(spec=DatabaseManager). Use a
+    MagicMock instead when a test needs to assert on the manager's calls.
+    
+    Args:
+        templates_coll: Object returned for the templates collection
+        forms_coll: Object returned for the filled forms collection
+        
+    Returns:
+        SimpleNamespace: Stub exposing the collection getters
+    """
+    return SimpleNamespace(
+        get_templates_collection=lambda: templates_coll,
+        get_filled_forms_collection=lambda: forms_coll,
+    )
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes and decodes with orjson when it's installed
+    
+    Output is always compact, so the separators argument Flask passes is
+    ignored. Calls with other json.dumps options (e.g. indent in debug mode),
+    or runs without orjson, fall back to the stdlib provider.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        kwargs.pop("separators", None)
+        if kwargs or orjson is None:
+            return super().dumps(obj, **kwargs)
+        
+        # Let Flask's default() format datetimes so responses look the same
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+    
+    def loads(self, s, **kwargs):
+        if kwargs or orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
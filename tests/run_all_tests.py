@@ -12,7 +12,7 @@ TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 sys.path.insert(0, TESTS_DIR)
 
-def run_unit_tests(specific_tests=None):
+def run_unit_tests(specific_tests=None, parallel=False):
     """Run unit tests with pytest"""
     # Set PYTHONPATH for subprocess
     env = os.environ.copy()
@@ -24,8 +24,22 @@ def run_unit_tests(specific_tests=None):
     cmd = ["python3", "-m", "pytest", "tests/unit"]
     if specific_tests:
         cmd.extend(specific_tests)
-    print(f"Running unit tests: {' '.join(cmd)}")
-    return subprocess.run(cmd, env=env).returncode
+    
+    if not parallel:
+        print(f"Running unit tests: {' '.join(cmd)}")
+        return subprocess.run(cmd, env=env).returncode
+    
+    # Spread the parallel-safe tests over pytest-xdist workers, then run the
+    # rest serially since they share files on disk
+    parallel_cmd = cmd + ["-n", "auto", "--dist=loadfile", "-m", "parallel_safe"]
+    serial_cmd = cmd + ["-m", "not parallel_safe"]
+    results = []
+    for run_cmd in (parallel_cmd, serial_cmd):
+        print(f"Running unit tests: {' '.join(run_cmd)}")
+        results.append(subprocess.run(run_cmd, env=env).returncode)
+    
+    # pytest exits with 5 when a marker selects no tests
+    return 1 if any(code not in (0, 5) for code in results) else 0
 
 def run_integration_tests(specific_tests=None):
     """Run integration tests with pytest"""
@@ -61,6 +75,8 @@ def main():
     parser.add_argument("--visualization", action="store_true", help="Run visualization tests")
     parser.add_argument("--all", action="store_true", help="Run all tests")
     parser.add_argument("--specific", nargs="+", help="Run specific test files")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run parallel-safe unit tests with pytest-xdist")
     
     args = parser.parse_args()
     
@@ -71,7 +87,7 @@ def main():
     results = []
     
     if args.all or args.unit:
-        results.append(run_unit_tests(args.specific))
+        results.append(run_unit_tests(args.specific, args.parallel))
     
     if args.all or args.integration:
         results.append(run_integration_tests(args.specific))
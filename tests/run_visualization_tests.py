@@ -15,11 +15,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Add the current directory to the path to fix imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-# Import path setup
-from path_setup import BASE_DIR
+# Add the project root to the path and import path setup through the tests
+# package. path_setup puts src/ first on the path, and src/tests.py would
+# shadow the tests package if it weren't imported before that.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.path_setup import BASE_DIR
 
 def run_tests():
     """Run all visualization tests."""
@@ -31,7 +31,7 @@ def run_tests():
     
     # Add consolidated core tests
     try:
-        from unit.visualization.test_visualization_core import TestVisualizationCore
+        from tests.unit.visualization.test_visualization_core import TestVisualizationCore
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestVisualizationCore))
         logger.info("Added visualization core tests")
     except ImportError as e:
@@ -39,7 +39,7 @@ def run_tests():
     
     # Add consolidated API tests
     try:
-        from unit.visualization.test_visualization_api import TestVisualizationAPI
+        from tests.unit.visualization.test_visualization_api import TestVisualizationAPI
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestVisualizationAPI))
         logger.info("Added visualization API tests")
     except ImportError as e:
@@ -47,7 +47,7 @@ def run_tests():
     
     # Add consolidated UI tests
     try:
-        from unit.visualization.test_visualization_ui import TestFieldVisualizationUI, TestCheckboxVisualizationUI, TestVisualizationAssets
+        from tests.unit.visualization.test_visualization_ui import TestFieldVisualizationUI, TestCheckboxVisualizationUI, TestVisualizationAssets
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestFieldVisualizationUI))
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestCheckboxVisualizationUI))
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestVisualizationAssets))
@@ -57,7 +57,7 @@ def run_tests():
     
     # Add consolidated E2E tests
     try:
-        from unit.visualization.test_visualization_e2e import TestCheckboxVisualizationE2E, TestFieldVisualizationE2E
+        from tests.unit.visualization.test_visualization_e2e import TestCheckboxVisualizationE2E, TestFieldVisualizationE2E
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestCheckboxVisualizationE2E))
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestFieldVisualizationE2E))
         logger.info("Added visualization E2E tests")
@@ -66,42 +66,42 @@ def run_tests():
     
     # For backward compatibility, add legacy visualization tests if they exist
     try:
-        from unit.visualization.test_visualization_feature import TestVisualizationFeature
+        from tests.unit.visualization.test_visualization_feature import TestVisualizationFeature
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestVisualizationFeature))
         logger.info("Added legacy visualization feature tests")
     except ImportError as e:
         logger.error(f"Error importing legacy visualization feature tests: {str(e)}")
     
     try:
-        from unit.test_visualization import TestVisualization
+        from tests.unit.test_visualization import TestVisualization
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestVisualization))
         logger.info("Added legacy visualization unit tests")
     except ImportError as e:
         logger.error(f"Error importing legacy visualization unit tests: {str(e)}")
     
     try:
-        from unit.test_visualization_api import TestVisualizationAPI
+        from tests.unit.test_visualization_api import TestVisualizationAPI
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestVisualizationAPI))
         logger.info("Added legacy visualization API tests")
     except ImportError as e:
         logger.error(f"Error importing legacy visualization API tests: {str(e)}")
     
     try:
-        from unit.test_field_overlay import TestFieldOverlay
+        from tests.unit.test_field_overlay import TestFieldOverlay
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestFieldOverlay))
         logger.info("Added legacy field overlay tests")
     except ImportError as e:
         logger.error(f"Error importing legacy field overlay tests: {str(e)}")
     
     try:
-        from unit.test_e2e_field_visualization import TestE2EFieldVisualization
+        from tests.unit.test_e2e_field_visualization import TestE2EFieldVisualization
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestE2EFieldVisualization))
         logger.info("Added legacy E2E field visualization tests")
     except ImportError as e:
         logger.error(f"Error importing legacy E2E field visualization tests: {str(e)}")
     
     try:
-        from unit.test_e2e_checkbox_visualization import TestE2ECheckboxVisualization
+        from tests.unit.test_e2e_checkbox_visualization import TestE2ECheckboxVisualization
         test_suite.addTest(test_loader.loadTestsFromTestCase(TestE2ECheckboxVisualization))
         logger.info("Added legacy E2E checkbox visualization tests")
     except ImportError as e:
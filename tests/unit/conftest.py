@@ -0,0 +1,13 @@
+"""
+Pytest configuration for the unit tests.
+"""
+import time
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """Make time.sleep a no-op so unit tests never wait on the wall clock."""
+    monkeypatch.setattr(time, "sleep", lambda *_: None)
+
@@ -15,7 +15,7 @@ from tests.path_setup import BASE_DIR, SRC_DIR
 
 # Now import the module to test
 sys.path.append(SRC_DIR)
-from db_core import DatabaseManager
+from db_core import DatabaseManager, FIELD_VALUE_INDEX_NAME
 
 
 class TestDatabaseManager(unittest.TestCase):
@@ -182,6 +182,14 @@ class TestDatabaseManager(unittest.TestCase):
         forms_coll.create_index.assert_any_call("template_id")
         forms_coll.create_index.assert_any_call("status")
         forms_coll.create_index.assert_any_call("created_at")
+        forms_coll.create_index.assert_any_call(
+            [
+                ("template_id", pymongo.ASCENDING),
+                ("field_values.key", pymongo.ASCENDING),
+                ("field_values.value", pymongo.ASCENDING)
+            ],
+            name=FIELD_VALUE_INDEX_NAME
+        )
         
         # Test with no db (test mode with db=None)
         db_manager.db = None
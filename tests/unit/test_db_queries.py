@@ -8,161 +8,132 @@ import datetime
 import pymongo
 from bson import ObjectId
 
-# Import path setup to handle imports from main project
-import sys
-import os
-# Add the tests directory to sys.path to allow importing from tests modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tests.path_setup import BASE_DIR, SRC_DIR
+from src.db_models import TemplateModel, FilledFormModel
+from src.db_queries import QueryBuilder, ComplexQueries
+from tests.helpers import db_stub
 
-# Now import the modules to test
-sys.path.append(SRC_DIR)
 
-from db_core import DatabaseManager
-from db_models import TemplateModel, FilledFormModel
-from db_queries import QueryBuilder, ComplexQueries
+# Fixed timestamp for test documents; keeps the data deterministic
+_NOW = datetime.datetime(2024, 1, 1, 0, 0, 0)
 
+# Shared date range used by the filter cases
+_CREATED_AFTER = datetime.datetime(2023, 1, 1)
+_CREATED_BEFORE = datetime.datetime(2023, 12, 31)
+_DATE_RANGE = {"$gte": _CREATED_AFTER, "$lte": _CREATED_BEFORE}
 
-class TestQueryBuilder(unittest.TestCase):
-    """Test cases for QueryBuilder class."""
-
-    def test_build_template_filter_empty(self):
-        """Test building an empty template filter."""
-        query = QueryBuilder.build_template_filter()
-        self.assertEqual(query, {})
-
-    def test_build_template_filter_tags(self):
-        """Test building a template filter with tags."""
-        tags = ["test", "sample"]
-        query = QueryBuilder.build_template_filter(tags=tags)
-        self.assertEqual(query, {"tags": {"$all": tags}})
-
-    def test_build_template_filter_name(self):
-        """Test building a template filter with name contains."""
-        name_contains = "Test Template"
-        query = QueryBuilder.build_template_filter(name_contains=name_contains)
-        self.assertEqual(query, {"name": {"$regex": name_contains, "$options": "i"}})
-
-    def test_build_template_filter_dates(self):
-        """Test building a template filter with date range."""
-        created_after = datetime.datetime(2023, 1, 1)
-        created_before = datetime.datetime(2023, 12, 31)
-        query = QueryBuilder.build_template_filter(
-            created_after=created_after, created_before=created_before
-        )
-        self.assertEqual(query, {
-            "created_at": {
-                "$gte": created_after,
-                "$lte": created_before
-            }
-        })
-
-    def test_build_template_filter_all(self):
-        """Test building a template filter with all parameters."""
-        tags = ["test", "sample"]
-        name_contains = "Test Template"
-        created_after = datetime.datetime(2023, 1, 1)
-        created_before = datetime.datetime(2023, 12, 31)
-        query = QueryBuilder.build_template_filter(
-            tags=tags,
-            name_contains=name_contains,
-            created_after=created_after,
-            created_before=created_before
-        )
-        self.assertEqual(query, {
-            "tags": {"$all": tags},
-            "name": {"$regex": name_contains, "$options": "i"},
-            "created_at": {
-                "$gte": created_after,
-                "$lte": created_before
-            }
-        })
-
-    def test_build_form_filter_empty(self):
-        """Test building an empty form filter."""
-        query = QueryBuilder.build_form_filter()
-        self.assertEqual(query, {})
+# (description, kwargs, expected filter) cases for build_template_filter
+TEMPLATE_FILTER_CASES = [
+    ("empty", {}, {}),
+    ("tags", {"tags": ["test", "sample"]}, {"tags": {"$all": ["test", "sample"]}}),
+    (
+        "name contains",
+        {"name_contains": "Test Template"},
+        {"name": {"$regex": "Test Template", "$options": "i"}}
+    ),
+    (
+        "date range",
+        {"created_after": _CREATED_AFTER, "created_before": _CREATED_BEFORE},
+        {"created_at": _DATE_RANGE}
+    ),
+    (
+        "all parameters",
+        {
+            "tags": ["test", "sample"],
+            "name_contains": "Test Template",
+            "created_after": _CREATED_AFTER,
+            "created_before": _CREATED_BEFORE
+        },
+        {
+            "tags": {"$all": ["test", "sample"]},
+            "name": {"$regex": "Test Template", "$options": "i"},
+            "created_at": _DATE_RANGE
+        }
+    ),
+]
 
-    def test_build_form_filter_template_id(self):
-        """Test building a form filter with template ID."""
-        template_id = "test-template-id"
-        query = QueryBuilder.build_form_filter(template_id=template_id)
-        self.assertEqual(query, {"template_id": template_id})
+# (description, kwargs, expected filter) cases for build_form_filter
+FORM_FILTER_CASES = [
+    ("empty", {}, {}),
+    ("template ID", {"template_id": "test-template-id"}, {"template_id": "test-template-id"}),
+    ("status", {"status": "draft"}, {"status": "draft"}),
+    (
+        "name contains",
+        {"name_contains": "Test Form"},
+        {"name": {"$regex": "Test Form", "$options": "i"}}
+    ),
+    (
+        "date range",
+        {"created_after": _CREATED_AFTER, "created_before": _CREATED_BEFORE},
+        {"created_at": _DATE_RANGE}
+    ),
+    (
+        "all parameters",
+        {
+            "template_id": "test-template-id",
+            "status": "draft",
+            "name_contains": "Test Form",
+            "created_after": _CREATED_AFTER,
+            "created_before": _CREATED_BEFORE
+        },
+        {
+            "template_id": "test-template-id",
+            "status": "draft",
+            "name": {"$regex": "Test Form", "$options": "i"},
+            "created_at": _DATE_RANGE
+        }
+    ),
+]
 
-    def test_build_form_filter_status(self):
-        """Test building a form filter with status."""
-        status = "draft"
-        query = QueryBuilder.build_form_filter(status=status)
-        self.assertEqual(query, {"status": status})
 
-    def test_build_form_filter_name(self):
-        """Test building a form filter with name contains."""
-        name_contains = "Test Form"
-        query = QueryBuilder.build_form_filter(name_contains=name_contains)
-        self.assertEqual(query, {"name": {"$regex": name_contains, "$options": "i"}})
+class TestQueryBuilder(unittest.TestCase):
+    """Test cases for QueryBuilder class."""
 
-    def test_build_form_filter_dates(self):
-        """Test building a form filter with date range."""
-        created_after = datetime.datetime(2023, 1, 1)
-        created_before = datetime.datetime(2023, 12, 31)
-        query = QueryBuilder.build_form_filter(
-            created_after=created_after, created_before=created_before
-        )
-        self.assertEqual(query, {
-            "created_at": {
-                "$gte": created_after,
-                "$lte": created_before
-            }
-        })
+    def test_build_template_filter(self):
+        """Test building template filters from each parameter combination."""
+        for description, kwargs, expected in TEMPLATE_FILTER_CASES:
+            with self.subTest(description):
+                self.assertEqual(QueryBuilder.build_template_filter(**kwargs), expected)
 
-    def test_build_form_filter_all(self):
-        """Test building a form filter with all parameters."""
-        template_id = "test-template-id"
-        status = "draft"
-        name_contains = "Test Form"
-        created_after = datetime.datetime(2023, 1, 1)
-        created_before = datetime.datetime(2023, 12, 31)
-        query = QueryBuilder.build_form_filter(
-            template_id=template_id,
-            status=status,
-            name_contains=name_contains,
-            created_after=created_after,
-            created_before=created_before
-        )
-        self.assertEqual(query, {
-            "template_id": template_id,
-            "status": status,
-            "name": {"$regex": name_contains, "$options": "i"},
-            "created_at": {
-                "$gte": created_after,
-                "$lte": created_before
-            }
-        })
+    def test_build_form_filter(self):
+        """Test building form filters from each parameter combination."""
+        for description, kwargs, expected in FORM_FILTER_CASES:
+            with self.subTest(description):
+                self.assertEqual(QueryBuilder.build_form_filter(**kwargs), expected)
 
 
 class TestComplexQueries(unittest.TestCase):
     """Test cases for ComplexQueries class."""
 
-    def setUp(self):
-        """Set up test environment."""
-        # Mock database manager, template model, and form model
-        self.mock_db_manager = MagicMock(spec=DatabaseManager)
-        self.mock_template_model = MagicMock(spec=TemplateModel)
-        self.mock_form_model = MagicMock(spec=FilledFormModel)
+    @classmethod
+    def setUpClass(cls):
+        """Build the mocks and instance under test once for the class."""
+        # Mock template model and form model
+        cls.mock_template_model = MagicMock(spec=TemplateModel)
+        cls.mock_form_model = MagicMock(spec=FilledFormModel)
         
         # Define mock collections
-        self.mock_templates_collection = MagicMock()
-        self.mock_forms_collection = MagicMock()
+        cls.mock_templates_collection = MagicMock()
+        cls.mock_forms_collection = MagicMock()
         
-        # Configure mocks
-        self.mock_db_manager.get_templates_collection.return_value = self.mock_templates_collection
-        self.mock_db_manager.get_filled_forms_collection.return_value = self.mock_forms_collection
+        # No test asserts on the database manager, so a plain stub is enough
+        cls.mock_db_manager = db_stub(cls.mock_templates_collection, cls.mock_forms_collection)
         
         # Patch TemplateModel and FilledFormModel to use our mocks
-        with patch('db_queries.TemplateModel', return_value=self.mock_template_model):
-            with patch('db_queries.FilledFormModel', return_value=self.mock_form_model):
+        with patch('src.db_queries.TemplateModel', return_value=cls.mock_template_model):
+            with patch('src.db_queries.FilledFormModel', return_value=cls.mock_form_model):
                 # Create instance under test
-                self.complex_queries = ComplexQueries(self.mock_db_manager)
+                cls.complex_queries = ComplexQueries(cls.mock_db_manager)
+
+    def setUp(self):
+        """Set up test environment."""
+        # Clear calls and configured return values left by the previous test
+        for mock in (
+            self.mock_template_model,
+            self.mock_form_model,
+            self.mock_templates_collection,
+            self.mock_forms_collection
+        ):
+            mock.reset_mock(return_value=True, side_effect=True)
         
         # Define test data
         self.test_template_id = "test-template-id"
@@ -173,8 +144,8 @@ class TestComplexQueries(unittest.TestCase):
             "document_data": {"pages": [], "mime_type": "application/pdf"},
             "checkboxes": [],
             "tags": ["test", "sample"],
-            "created_at": datetime.datetime.utcnow(),
-            "updated_at": datetime.datetime.utcnow()
+            "created_at": _NOW,
+            "updated_at": _NOW
         }
         
         self.test_form = {
@@ -185,8 +156,8 @@ class TestComplexQueries(unittest.TestCase):
             "field_values": [],
             "status": "draft",
             "exports": [],
-            "created_at": datetime.datetime.utcnow(),
-            "updated_at": datetime.datetime.utcnow()
+            "created_at": _NOW,
+            "updated_at": _NOW
         }
 
     def test_get_template_with_filled_forms(self):
@@ -248,10 +219,31 @@ class TestComplexQueries(unittest.TestCase):
             "name": {"$regex": "Test", "$options": "i"},
             "tags": {"$all": ["test"]}
         }
-        self.mock_templates_collection.find.assert_called_once_with(expected_query)
+        self.mock_templates_collection.find.assert_called_once_with(
+            expected_query, {"document_data": 0}
+        )
         mock_cursor.skip.assert_called_once_with(0)
         mock_cursor.limit.assert_called_once_with(10)
 
+    def test_find_projected_include(self):
+        """Test that included fields take precedence over excluded ones."""
+        # Mock templates collection find
+        self.mock_templates_collection.find.return_value = [self.test_template]
+        
+        # Call the method under test
+        results = self.complex_queries._find_projected(
+            self.mock_templates_collection,
+            {"tags": "test"},
+            include=["template_id", "name"],
+            exclude=["document_data"]
+        )
+        
+        # Assert the results were returned without pagination
+        self.assertEqual(results, [self.test_template])
+        self.mock_templates_collection.find.assert_called_once_with(
+            {"tags": "test"}, {"template_id": 1, "name": 1}
+        )
+
     def test_get_form_statistics(self):
         """Test getting form statistics."""
         # Mock aggregate result
@@ -269,17 +261,21 @@ class TestComplexQueries(unittest.TestCase):
         self.assertEqual(stats["by_status"]["completed"], 3)
         
         # Verify the collection method was called with correct arguments
-        self.mock_forms_collection.aggregate.assert_called_once()
-        pipeline_arg = self.mock_forms_collection.aggregate.call_args[0][0]
-        self.assertEqual(len(pipeline_arg), 2)
-        self.assertEqual(pipeline_arg[0]["$match"], {"template_id": self.test_template_id})
-        self.assertEqual(pipeline_arg[1]["$group"]["_id"], "$status")
-        self.assertEqual(pipeline_arg[1]["$group"]["count"]["$sum"], 1)
+        self.mock_forms_collection.aggregate.assert_called_once_with(
+            [
+                {"$match": {"template_id": self.test_template_id}},
+                {"$sortByCount": "$status"}
+            ],
+            allowDiskUse=False
+        )
 
     def test_get_templates_with_form_counts(self):
         """Test getting templates with form counts."""
-        # Mock template model list
-        self.mock_template_model.list.return_value = [self.test_template]
+        # Mock templates collection find
+        mock_cursor = MagicMock()
+        mock_cursor.skip.return_value = mock_cursor
+        mock_cursor.limit.return_value = [self.test_template]
+        self.mock_templates_collection.find.return_value = mock_cursor
         
         # Mock forms collection aggregate
         self.mock_forms_collection.aggregate.return_value = [
@@ -294,8 +290,10 @@ class TestComplexQueries(unittest.TestCase):
         self.assertEqual(results[0]["template_id"], self.test_template_id)
         self.assertEqual(results[0]["form_count"], 5)
         
-        # Verify the model and collection methods were called with correct arguments
-        self.mock_template_model.list.assert_called_once_with(skip=0, limit=10)
+        # Verify the collection methods were called with correct arguments
+        self.mock_templates_collection.find.assert_called_once_with({}, {"document_data": 0})
+        mock_cursor.skip.assert_called_once_with(0)
+        mock_cursor.limit.assert_called_once_with(10)
         self.mock_forms_collection.aggregate.assert_called_once()
         pipeline_arg = self.mock_forms_collection.aggregate.call_args[0][0]
         self.assertEqual(len(pipeline_arg), 2)
@@ -303,10 +301,24 @@ class TestComplexQueries(unittest.TestCase):
         self.assertEqual(pipeline_arg[1]["$group"]["_id"], "$template_id")
         self.assertEqual(pipeline_arg[1]["$group"]["count"]["$sum"], 1)
 
+    def test_get_templates_with_form_counts_error(self):
+        """Test that a database error while listing templates returns an empty list."""
+        # Mock the templates query failing
+        self.mock_templates_collection.find.side_effect = pymongo.errors.PyMongoError("connection lost")
+        
+        # Call the method under test
+        results = self.complex_queries.get_templates_with_form_counts()
+        
+        # Assert no templates were returned and no counts were queried
+        self.assertEqual(results, [])
+        self.mock_forms_collection.aggregate.assert_not_called()
+
     def test_find_forms_with_field_value(self):
         """Test finding forms with a specific field value."""
-        # Mock forms collection find
-        self.mock_forms_collection.find.return_value = [self.test_form]
+        # Mock forms collection find; the hinted cursor yields the form
+        mock_cursor = MagicMock()
+        mock_cursor.hint.return_value.__iter__.return_value = iter([self.test_form])
+        self.mock_forms_collection.find.return_value = mock_cursor
         
         # Call the method under test
         results = self.complex_queries.find_forms_with_field_value(
@@ -321,16 +333,40 @@ class TestComplexQueries(unittest.TestCase):
         
         # Verify the collection method was called with correct arguments
         expected_query = {
+            "template_id": self.test_template_id,
             "field_values": {
                 "$elemMatch": {
                     "key": "field_1",
                     "value": True
                 }
-            },
-            "template_id": self.test_template_id
+            }
         }
         self.mock_forms_collection.find.assert_called_once_with(expected_query)
+        query_arg = self.mock_forms_collection.find.call_args[0][0]
+        self.assertEqual(list(query_arg.keys()), ["template_id", "field_values"])
+        mock_cursor.hint.assert_called_once_with("fv_template_key_value")
 
+    def test_find_forms_with_field_value_no_template(self):
+        """Test finding forms by field value across all templates."""
+        # Mock forms collection find
+        self.mock_forms_collection.find.return_value = [self.test_form]
+        
+        # Call the method under test
+        results = self.complex_queries.find_forms_with_field_value(
+            field_key="field_1",
+            field_value=True
+        )
+        
+        # Assert the query ran without the template index hint
+        self.assertEqual(results, [self.test_form])
+        self.mock_forms_collection.find.assert_called_once_with({
+            "field_values": {
+                "$elemMatch": {
+                    "key": "field_1",
+                    "value": True
+                }
+            }
+        })
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
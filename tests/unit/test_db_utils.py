@@ -5,28 +5,20 @@ Unit tests for the db_utils module.
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import json
-import os
-import tempfile
 import datetime
-
-# Import path setup to handle imports from main project
-import sys
-# Add the tests directory to sys.path to allow importing from tests modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tests.path_setup import BASE_DIR, SRC_DIR
-from tests.test_config import get_test_resource_path
-
-# Now import the modules to test
-sys.path.append(SRC_DIR)
+import uuid
 
 from bson import ObjectId
 import bson
 import pymongo
 
-from db_utils import (
+from src import db_utils
+from src.db_utils import (
     MongoJSONEncoder,
+    dumps,
     serialize_mongo_doc,
     serialize_mongo_docs,
+    iter_serialize_mongo_docs,
     generate_uuid,
     parse_date_param,
     validate_object_id,
@@ -39,6 +31,28 @@ from db_utils import (
     DatabaseHelpers
 )
 
+# Shared immutable test values, built once instead of in every test
+_FIXED_OID = ObjectId("507f1f77bcf86cd799439011")
+_OTHER_OID = ObjectId("507f1f77bcf86cd799439012")
+_FIXED_DT = datetime.datetime(2023, 1, 1, 12, 0, 0)
+
+# Values that orjson can encode natively, with the output both dumps()
+# backends must produce for them
+_TYPED_VALUES = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "date": datetime.date(2023, 1, 1),
+    "time": datetime.time(12, 30, 0, 500),
+    "aware": datetime.datetime(2023, 1, 1, 12, 0, 0, 500, tzinfo=datetime.timezone.utc),
+    "label": "Café",
+}
+_TYPED_VALUES_JSON = {
+    "id": "12345678-1234-5678-1234-567812345678",
+    "date": "2023-01-01",
+    "time": "12:30:00.000500",
+    "aware": "2023-01-01T12:00:00.000500+00:00",
+    "label": "Café",
+}
+
 
 class TestMongoJSONEncoder(unittest.TestCase):
     """Test cases for MongoJSONEncoder class."""
@@ -46,7 +60,7 @@ class TestMongoJSONEncoder(unittest.TestCase):
     def test_encode_objectid(self):
         """Test encoding ObjectId."""
         # Setup
-        test_id = bson.ObjectId()
+        test_id = _FIXED_OID
         test_obj = {"_id": test_id}
         
         # Execute
@@ -58,7 +72,7 @@ class TestMongoJSONEncoder(unittest.TestCase):
     def test_encode_datetime(self):
         """Test encoding datetime."""
         # Setup
-        test_date = datetime.datetime(2023, 1, 1, 12, 0, 0)
+        test_date = _FIXED_DT
         test_obj = {"created_at": test_date}
         
         # Execute
@@ -81,6 +95,71 @@ class TestMongoJSONEncoder(unittest.TestCase):
         # Execute & Assert (should not raise exception)
         json.dumps(test_obj, cls=MongoJSONEncoder)
 
+    def test_encode_unsupported_type(self):
+        """Test encoding an unsupported type raises TypeError."""
+        with self.assertRaises(TypeError):
+            json.dumps({"value": object()}, cls=MongoJSONEncoder)
+
+
+class TestDumps(unittest.TestCase):
+    """Test cases for the dumps function."""
+
+    def test_dumps_mongo_types(self):
+        """Test dumping ObjectId and datetime values."""
+        # Setup
+        test_obj = {
+            "_id": _FIXED_OID,
+            "created_at": datetime.datetime(2023, 1, 1, 12, 0, 0),
+            "tags": ["a", "b"]
+        }
+        
+        # Execute
+        result = dumps(test_obj)
+        
+        # Assert
+        self.assertIsInstance(result, bytes)
+        self.assertEqual(json.loads(result), {
+            "_id": str(_FIXED_OID),
+            "created_at": "2023-01-01T12:00:00",
+            "tags": ["a", "b"]
+        })
+
+    def test_dumps_matches_encoder(self):
+        """Test dumps produces the same data as MongoJSONEncoder."""
+        # Setup
+        test_obj = {
+            "_id": _FIXED_OID,
+            "nested": {"updated_at": datetime.datetime(2023, 1, 1, 12, 0, 0, 500)}
+        }
+        
+        # Execute
+        expected = json.loads(json.dumps(test_obj, cls=MongoJSONEncoder))
+        
+        # Assert
+        self.assertEqual(json.loads(dumps(test_obj)), expected)
+
+    def test_dumps_unsupported_type(self):
+        """Test dumping an unsupported type raises TypeError."""
+        with self.assertRaises(TypeError):
+            dumps({"value": object()})
+
+    def test_dumps_stdlib_backend(self):
+        """Test the standard library fallback encodes dates, times and UUIDs."""
+        with patch('src.db_utils.orjson', None):
+            result = dumps(_TYPED_VALUES)
+        
+        self.assertEqual(json.loads(result), _TYPED_VALUES_JSON)
+        self.assertIn("Café".encode("utf-8"), result)
+
+    @unittest.skipIf(db_utils.orjson is None, "orjson is not installed")
+    def test_dumps_orjson_backend(self):
+        """Test orjson encodes dates, times and UUIDs like the fallback."""
+        result = dumps(_TYPED_VALUES)
+        
+        self.assertEqual(json.loads(result), _TYPED_VALUES_JSON)
+        with patch('src.db_utils.orjson', None):
+            self.assertEqual(result, dumps(_TYPED_VALUES))
+
 
 class TestSerializeMongoDocs(unittest.TestCase):
     """Test cases for serialize_mongo_doc and serialize_mongo_docs functions."""
@@ -88,7 +167,7 @@ class TestSerializeMongoDocs(unittest.TestCase):
     def test_serialize_mongo_doc_objectid(self):
         """Test serializing a document with ObjectId."""
         # Setup
-        test_id = bson.ObjectId()
+        test_id = _FIXED_OID
         test_doc = {"_id": test_id}
         
         # Execute
@@ -100,7 +179,7 @@ class TestSerializeMongoDocs(unittest.TestCase):
     def test_serialize_mongo_doc_datetime(self):
         """Test serializing a document with datetime."""
         # Setup
-        test_date = datetime.datetime(2023, 1, 1, 12, 0, 0)
+        test_date = _FIXED_DT
         test_doc = {"created_at": test_date}
         
         # Execute
@@ -112,8 +191,8 @@ class TestSerializeMongoDocs(unittest.TestCase):
     def test_serialize_mongo_doc_nested(self):
         """Test serializing a document with nested structures."""
         # Setup
-        test_id = ObjectId("507f1f77bcf86cd799439011")
-        nested_id = ObjectId("507f1f77bcf86cd799439012")
+        test_id = _FIXED_OID
+        nested_id = _OTHER_OID
         test_doc = {
             "_id": test_id,
             "items": [
@@ -132,6 +211,31 @@ class TestSerializeMongoDocs(unittest.TestCase):
         self.assertEqual(result["items"][0]["name"], "Item 1")
         self.assertEqual(result["items"][1]["name"], "Item 2")
 
+    def test_serialize_mongo_doc_scalars(self):
+        """Test that plain scalar values are copied through unchanged."""
+        # Setup
+        test_doc = {
+            "name": "Doc",
+            "count": 3,
+            "ratio": 0.5,
+            "is_active": False,
+            "missing": None,
+            "_id": _FIXED_OID
+        }
+        
+        # Execute
+        result = serialize_mongo_doc(test_doc)
+        
+        # Assert
+        self.assertEqual(result, {
+            "name": "Doc",
+            "count": 3,
+            "ratio": 0.5,
+            "is_active": False,
+            "missing": None,
+            "_id": str(_FIXED_OID)
+        })
+
     def test_serialize_mongo_doc_none(self):
         """Test serializing None."""
         result = serialize_mongo_doc(None)
@@ -140,8 +244,8 @@ class TestSerializeMongoDocs(unittest.TestCase):
     def test_serialize_mongo_docs(self):
         """Test serializing multiple MongoDB documents."""
         # Setup
-        test_id1 = bson.ObjectId()
-        test_id2 = bson.ObjectId()
+        test_id1 = _FIXED_OID
+        test_id2 = _OTHER_OID
         test_docs = [
             {"_id": test_id1, "name": "Doc 1"},
             {"_id": test_id2, "name": "Doc 2"}
@@ -155,18 +259,33 @@ class TestSerializeMongoDocs(unittest.TestCase):
         self.assertEqual(result[0]["_id"], str(test_id1))
         self.assertEqual(result[1]["_id"], str(test_id2))
 
+    def test_iter_serialize_mongo_docs(self):
+        """Test lazily serializing MongoDB documents."""
+        # Setup
+        test_docs = iter([
+            {"_id": _FIXED_OID, "created_at": _FIXED_DT},
+            {"_id": _OTHER_OID, "name": "Doc 2"}
+        ])
+        
+        # Execute
+        result = iter_serialize_mongo_docs(test_docs)
+        
+        # Assert
+        self.assertEqual(next(result), {"_id": str(_FIXED_OID), "created_at": "2023-01-01T12:00:00"})
+        self.assertEqual(list(result), [{"_id": str(_OTHER_OID), "name": "Doc 2"}])
+
 
 class TestUtilityFunctions(unittest.TestCase):
     """Test cases for utility functions."""
 
-    @patch('db_utils.uuid.uuid4')
+    @patch('src.db_utils.uuid.uuid4')
     def test_generate_uuid(self, mock_uuid):
         """Test generating a UUID."""
         # Setup
         mock_uuid.return_value = "test-uuid"
         
         # Execute
-        from db_utils import generate_uuid
+        from src.db_utils import generate_uuid
         result = generate_uuid()
         
         # Assert
@@ -174,7 +293,7 @@ class TestUtilityFunctions(unittest.TestCase):
 
     def test_validate_object_id_valid(self):
         """Test validating a valid ObjectId."""
-        valid_id = str(bson.ObjectId())
+        valid_id = str(_FIXED_OID)
         self.assertTrue(validate_object_id(valid_id))
 
     def test_validate_object_id_invalid(self):
@@ -197,6 +316,11 @@ class TestUtilityFunctions(unittest.TestCase):
         result = parse_date_param(date_str)
         self.assertIsNone(result)
 
+    def test_parse_date_param_date_only(self):
+        """Test parsing a date parameter without a time component."""
+        result = parse_date_param("2023-01-01")
+        self.assertEqual(result, datetime.datetime(2023, 1, 1))
+
     def test_parse_date_param_none(self):
         """Test parsing None as a date parameter."""
         result = parse_date_param(None)
@@ -236,6 +360,20 @@ class TestUtilityFunctions(unittest.TestCase):
         self.assertEqual(set(result[0].keys()), {"_id", "name", "value"})
         self.assertEqual(set(result[1].keys()), {"_id", "name", "value"})
 
+    def test_format_query_results_include_missing_field(self):
+        """Test that included fields missing from a result are skipped."""
+        # Setup
+        docs = [
+            {"_id": "1", "name": "Doc 1", "value": 100},
+            {"_id": "2", "value": 200}
+        ]
+        
+        # Execute
+        result = format_query_results(docs, include_fields=["name", "value"])
+        
+        # Assert
+        self.assertEqual(result, [{"name": "Doc 1", "value": 100}, {"value": 200}])
+
     def test_format_query_results_empty(self):
         """Test formatting empty query results."""
         result = format_query_results([])
@@ -304,6 +442,13 @@ class TestUtilityFunctions(unittest.TestCase):
         result = build_sort_options(sort_by="value", sort_order="desc")
         self.assertEqual(result, [("value", pymongo.DESCENDING)])
 
+    def test_build_sort_options_returns_new_list(self):
+        """Test that mutating a result doesn't affect later calls."""
+        result = build_sort_options(sort_by="name", sort_order="asc")
+        result.append(("value", pymongo.DESCENDING))
+        self.assertEqual(build_sort_options(sort_by="name", sort_order="asc"),
+                         [("name", pymongo.ASCENDING)])
+
     def test_extract_query_params(self):
         """Test extracting query parameters."""
         # Setup
@@ -324,6 +469,14 @@ class TestUtilityFunctions(unittest.TestCase):
         self.assertNotIn("invalid", extracted)
         self.assertNotIn("none_value", extracted)
 
+    def test_extract_query_params_drops_none(self):
+        """Test that allowed parameters with None values are dropped."""
+        params = {"name": "Test", "status": None}
+        
+        extracted = extract_query_params(params, ["name", "status"])
+        
+        self.assertEqual(extracted, {"name": "Test"})
+
 
 class TestDocumentSerializer(unittest.TestCase):
     """Test cases for DocumentSerializer class."""
@@ -331,8 +484,8 @@ class TestDocumentSerializer(unittest.TestCase):
     def test_serialize_document(self):
         """Test serializing a document."""
         # Setup test document with ObjectId and datetime
-        test_id = bson.ObjectId()
-        test_date = datetime.datetime.utcnow()
+        test_id = _FIXED_OID
+        test_date = _FIXED_DT
         test_doc = {
             "_id": test_id,
             "name": "Test Document",
@@ -362,6 +515,17 @@ class TestDocumentSerializer(unittest.TestCase):
         self.assertEqual(result["array"][1], str(test_id))
         self.assertIsInstance(result["array"][2], str)
     
+    def test_serialize_document_generated_values(self):
+        """Test serializing freshly generated ObjectId and datetime values."""
+        # The other tests use fixed values; this one guards the live path
+        test_id = bson.ObjectId()
+        test_date = datetime.datetime.utcnow()
+        
+        result = DocumentSerializer.serialize_document({"_id": test_id, "created_at": test_date})
+        
+        self.assertEqual(result["_id"], str(test_id))
+        self.assertEqual(result["created_at"], test_date.isoformat())
+    
     def test_serialize_document_empty(self):
         """Test serializing an empty document."""
         result = DocumentSerializer.serialize_document({})
@@ -370,8 +534,8 @@ class TestDocumentSerializer(unittest.TestCase):
     def test_deserialize_document(self):
         """Test deserializing a document."""
         # Setup serialized document
-        test_id_str = str(bson.ObjectId())
-        test_date_str = datetime.datetime.utcnow().isoformat()
+        test_id_str = str(_FIXED_OID)
+        test_date_str = _FIXED_DT.isoformat()
         test_doc = {
             "_id": test_id_str,
             "name": "Test Document",
@@ -413,10 +577,17 @@ class TestDocumentSerializer(unittest.TestCase):
         result = DocumentSerializer.deserialize_document(test_doc)
         self.assertEqual(result["_id"], "invalid-object-id")
     
+    def test_deserialize_document_list_strings(self):
+        """Test deserializing a list of plain strings leaves them unchanged."""
+        test_doc = {"tags": ["Test", "Tag", "2023 report"]}
+        
+        result = DocumentSerializer.deserialize_document(test_doc)
+        self.assertEqual(result["tags"], ["Test", "Tag", "2023 report"])
+    
     def test_deserialize_document_invalid_date(self):
         """Test deserializing a document with invalid date."""
         test_doc = {
-            "_id": str(bson.ObjectId()),
+            "_id": str(_FIXED_OID),
             "created_at": "invalid-date-format"
         }
         
@@ -4,13 +4,10 @@ Unit tests for the field overlay visualization feature.
 
 import unittest
 import os
-import json
-import tempfile
-import shutil
-from flask import Flask, template_rendered, jsonify
+from collections import Counter
+from flask import Flask, template_rendered, jsonify, send_from_directory
 from contextlib import contextmanager
 from flask import appcontext_pushed, g
-from pdf2image import convert_from_path
 from PIL import Image
 import base64
 from io import BytesIO
@@ -20,7 +17,12 @@ import pytest
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tests.path_setup import BASE_DIR, SRC_DIR
-from tests.test_config import get_test_resource_path, get_test_pdf_path
+from tests.test_config import get_test_resource_path
+from tests.helpers import OrjsonProvider
+
+# Pages of test_form.pdf pre-rendered at 200 DPI (pdf2image's default), so
+# the tests don't need Poppler
+TEST_FORM_PAGES_DIR = get_test_resource_path(os.path.join('pages', 'test_form'))
 
 # Sample field data for testing
 SAMPLE_FIELDS = [
@@ -78,83 +80,92 @@ SAMPLE_FIELDS = [
     }
 ]
 
+# Field counts by type, computed once since SAMPLE_FIELDS never changes
+_FIELD_TYPES = dict(Counter(f.get("type", "other") for f in SAMPLE_FIELDS))
+
+# Static part of the visualization API response
+_RESPONSE_TEMPLATE = {
+    "document_name": "Test Form",
+    "processing_date": "2023-11-30T12:00:00Z",
+    "fields": SAMPLE_FIELDS,
+    "field_types": _FIELD_TYPES
+}
+
+def _page_image_files(pages_dir):
+    """
+    List pre-rendered page images in page order
+    
+    Args:
+        pages_dir (str): Directory holding page_<n>.png files
+        
+    Returns:
+        list: Image filenames sorted by page number
+    """
+    names = [n for n in os.listdir(pages_dir) if n.startswith("page_") and n.endswith(".png")]
+    return sorted(names, key=lambda n: int(n[len("page_"):-len(".png")]))
+
+
 class TestFieldOverlay(unittest.TestCase):
     """Test cases for field overlay visualization."""
     
-    def setUp(self):
-        """Set up test environment."""
+    @classmethod
+    def setUpClass(cls):
+        """Build the test app and register its routes once for the class."""
         # Create Flask test app
-        self.app = Flask(__name__,
-                         template_folder=os.path.join(SRC_DIR, 'templates'),
-                         static_folder=os.path.join(SRC_DIR, 'static'))
-        self.app.testing = True
-        self.client = self.app.test_client()
+        app = cls.app = Flask(__name__,
+                              template_folder=os.path.join(SRC_DIR, 'templates'),
+                              static_folder=os.path.join(SRC_DIR, 'static'))
+        app.testing = True
+        app.json = OrjsonProvider(app)
         
         # Test document details
-        self.test_document_id = "test_doc_123"
-        self.pdf_path = get_test_pdf_path("test_form.pdf")
-        
-        # Create a temporary directory for page images
-        self.temp_dir = tempfile.mkdtemp()
+        cls.test_document_id = "test_doc_123"
         
         # Set up routes for testing
-        @self.app.route('/ui/field-visualization/<document_id>')
+        @app.route('/ui/field-visualization/<document_id>')
         def field_visualization_ui(document_id):
             """Serve the field visualization template."""
-            return self.app.send_static_file('field_visualization.html')
+            return app.send_static_file('field_visualization.html')
         
-        @self.app.route('/api/field-visualization/<document_id>')
+        @app.route('/api/field-visualization/<document_id>')
         def get_field_visualization_data(document_id):
             """API endpoint to get field extraction visualization data."""
-            # Convert PDF pages to images
             try:
-                pages = convert_from_path(self.pdf_path)
+                pages = _page_image_files(TEST_FORM_PAGES_DIR)
                 page_data = []
                 
-                for i, page_image in enumerate(pages):
-                    # Save the page image
-                    page_number = i + 1
-                    image_path = os.path.join(self.temp_dir, f"page_{page_number}.png")
-                    page_image.save(image_path)
+                for page_number, filename in enumerate(pages, 1):
+                    # Opening the image only reads the PNG header for its size
+                    with Image.open(os.path.join(TEST_FORM_PAGES_DIR, filename)) as page_image:
+                        width, height = page_image.size
                     
                     # Create page data
                     page_data.append({
                         "page_number": page_number,
-                        "image_url": f"/test/pages/page_{page_number}.png",
-                        "width": page_image.width,
-                        "height": page_image.height
+                        "image_url": f"/test/pages/{filename}",
+                        "width": width,
+                        "height": height
                     })
                 
-                # Count fields by type
-                field_types = {}
-                for field in SAMPLE_FIELDS:
-                    field_type = field.get("type", "other")
-                    field_types[field_type] = field_types.get(field_type, 0) + 1
-                
                 # Return full visualization data
                 return jsonify({
+                    **_RESPONSE_TEMPLATE,
                     "document_id": document_id,
-                    "document_name": "Test Form",
-                    "processing_date": "2023-11-30T12:00:00Z",
                     "total_pages": len(pages),
-                    "pages": page_data,
-                    "fields": SAMPLE_FIELDS,
-                    "field_types": field_types
+                    "pages": page_data
                 })
             
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
         
-        @self.app.route('/test/pages/<filename>')
+        @app.route('/test/pages/<filename>')
         def serve_page_image(filename):
-            """Serve the page images from the temporary directory."""
-            return self.app.send_static_file(os.path.join(self.temp_dir, filename))
+            """Serve the pre-rendered page images."""
+            return send_from_directory(TEST_FORM_PAGES_DIR, filename)
     
-    def tearDown(self):
-        """Clean up after tests."""
-        # Remove temporary directory
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+    def setUp(self):
+        """Create a test client."""
+        self.client = self.app.test_client()
     
     def test_visualization_endpoint(self):
         """Test the field visualization API endpoint."""
@@ -162,7 +173,7 @@ class TestFieldOverlay(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         
         # Verify response data
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['document_id'], self.test_document_id)
         self.assertIn('fields', data)
         self.assertIn('pages', data)
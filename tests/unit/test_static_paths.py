@@ -7,9 +7,11 @@ This script verifies that the static file path configuration in app.py is workin
 import os
 import sys
 import json
-import requests
+import itertools
 import logging
+import uuid
 import pytest
+from pathlib import Path
 from pprint import pprint
 from datetime import datetime
 
@@ -23,20 +25,22 @@ from tests.test_config import TEST_TEMPLATES_DIR, TEST_PDFS_DIR, get_test_resour
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Check if Flask app is running
-def check_flask_app():
+def load_test_client():
+    """Import the Flask app and return an in-process test client."""
+    from src import app as flask_app
+    flask_app.app.config['TESTING'] = True
+    return flask_app.app.test_client()
+
+@pytest.fixture(scope="session")
+def client():
+    """In-process client shared by all tests; skips them if the app can't be loaded."""
     try:
-        response = requests.get('http://localhost:5004/api/health')
-        return response.status_code == 200
-    except requests.exceptions.ConnectionError:
-        logger.error("Flask app is not running. Please start it with 'python app.py'.")
-        return False
+        return load_test_client()
+    except Exception as e:
+        pytest.skip(f"Flask app could not be loaded ({e}). Skipping test.")
 
-def test_static_file_access():
+def test_static_file_access(client):
     """Test if static files can be accessed."""
-    if not check_flask_app():
-        pytest.skip("Flask app is not running. Skipping test.")
-
     # Test static files
     static_files = [
         '/static/css/main.css',
@@ -46,7 +50,7 @@ def test_static_file_access():
 
     for file_path in static_files:
         logger.info(f"Testing static file: {file_path}")
-        response = requests.get(f'http://localhost:5004{file_path}')
+        response = client.get(file_path)
         
         if response.status_code == 200:
             logger.info(f"✅ Static file accessible: {file_path}")
@@ -57,19 +61,18 @@ def test_static_file_access():
     
     logger.info("Static file access test completed.")
 
-def test_visualization_access():
+def test_visualization_access(client):
     """Test if visualization files can be accessed."""
-    if not check_flask_app():
-        pytest.skip("Flask app is not running. Skipping test.")
-
     # Find visualization files
     visualization_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'static/visualizations')
     if not os.path.exists(visualization_dir):
         logger.error(f"Visualization directory not found: {visualization_dir}")
         return
     
-    # Test first 3 visualization files
-    visualization_files = [f for f in os.listdir(visualization_dir) if f.endswith('.html')][:3]
+    # Test first 3 visualization files, without listing the whole directory
+    with os.scandir(visualization_dir) as entries:
+        visualization_files = list(itertools.islice(
+            (entry.name for entry in entries if entry.name.endswith('.html')), 3))
     
     if not visualization_files:
         logger.warning("No visualization files found to test.")
@@ -78,7 +81,7 @@ def test_visualization_access():
     for file_name in visualization_files:
         file_path = f'/static/visualizations/{file_name}'
         logger.info(f"Testing visualization file: {file_path}")
-        response = requests.get(f'http://localhost:5004{file_path}')
+        response = client.get(file_path)
         
         if response.status_code == 200:
             logger.info(f"✅ Visualization file accessible: {file_path}")
@@ -89,13 +92,10 @@ def test_visualization_access():
     
     logger.info("Visualization access test completed.")
 
-def test_static_file_sync():
+def test_static_file_sync(client):
     """Test if static file changes are reflected immediately."""
-    if not check_flask_app():
-        pytest.skip("Flask app is not running. Skipping test.")
-    
-    # Create a temporary test file
-    test_file_name = f"test_file_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    # Create a temporary test file, named per process so parallel workers don't collide
+    test_file_name = f"test_file_{os.getpid()}_{uuid.uuid4().hex}.txt"
     test_file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), f'static/{test_file_name}')
     
     try:
@@ -106,7 +106,7 @@ def test_static_file_sync():
         logger.info(f"Created test file: {test_file_path}")
         
         # Test if the file is accessible
-        response = requests.get(f'http://localhost:5004/static/{test_file_name}')
+        response = client.get(f'/static/{test_file_name}')
         
         if response.status_code == 200:
             logger.info(f"✅ Test file accessible: /static/{test_file_name}")
@@ -123,24 +123,30 @@ def test_static_file_sync():
     
     logger.info("Static file sync test completed.")
 
-def force_visualization_regeneration():
-    """Force regeneration of visualizations to test the process."""
-    if not check_flask_app():
-        pytest.skip("Flask app is not running. Skipping test.")
-    
+def load_visualization_inputs():
+    """Return (pdf_path, template) for the regeneration check, or None if a file is missing."""
     pdf_path = os.path.join(TEST_PDFS_DIR, 'test_visualization_form.pdf')
     if not os.path.exists(pdf_path):
         logger.error(f"Test PDF not found: {pdf_path}")
-        return
+        return None
     
     template_path = os.path.join(TEST_TEMPLATES_DIR, 'test_visualization_template.json')
-    if not os.path.exists(template_path):
+    try:
+        template = json.loads(Path(template_path).read_bytes())
+    except FileNotFoundError:
         logger.error(f"Test template not found: {template_path}")
-        return
+        return None
+    
+    return pdf_path, template
+
+def force_visualization_regeneration(client, visualization_inputs):
+    """
+    Force regeneration of visualizations to test the process.
     
-    # Load the template
-    with open(template_path, 'r') as f:
-        template = json.load(f)
+    Only run from run_tests(): it writes new visualization files, so it
+    isn't collected by pytest.
+    """
+    pdf_path, template = visualization_inputs
     
     # Prepare data for visualization request
     data = {
@@ -151,10 +157,10 @@ def force_visualization_regeneration():
     
     # Request visualization generation
     logger.info("Requesting visualization generation...")
-    response = requests.post('http://localhost:5004/api/visualize', json=data)
+    response = client.post('/api/visualize', json=data)
     
     if response.status_code == 200:
-        result = response.json()
+        result = response.get_json()
         logger.info("✅ Visualization generation successful")
         logger.info(f"Visualization URL: {result.get('visualizationUrl')}")
         
@@ -165,7 +171,7 @@ def force_visualization_regeneration():
             if viz_url.startswith('/'):
                 viz_url = viz_url[1:]
             
-            viz_response = requests.get(f'http://localhost:5004/{viz_url}')
+            viz_response = client.get(f'/{viz_url}')
             
             if viz_response.status_code == 200:
                 logger.info(f"✅ Generated visualization accessible: {viz_url}")
@@ -184,11 +190,16 @@ def run_tests():
     """Run all tests."""
     logger.info("Starting static path tests...")
     
+    client = load_test_client()
+    
     # Run tests
-    test_static_file_access()
-    test_visualization_access()
-    test_static_file_sync()
-    force_visualization_regeneration()
+    test_static_file_access(client)
+    test_visualization_access(client)
+    test_static_file_sync(client)
+    
+    visualization_inputs = load_visualization_inputs()
+    if visualization_inputs is not None:
+        force_visualization_regeneration(client, visualization_inputs)
     
     logger.info("All static path tests completed.")
 
@@ -4,10 +4,10 @@ Unit tests for visualization functions.
 
 import os
 import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import json
-import tempfile
 from datetime import datetime
 
 from src.visualization import (
@@ -19,21 +19,54 @@ from src.visualization import (
 )
 
 
+class _DrawRecorder:
+    """Stand-in for an ImageDraw.Draw that records the shapes drawn on it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def rectangle(self, *args, **kwargs):
+        self.calls.append(("rectangle", args, kwargs))
+
+    def text(self, *args, **kwargs):
+        self.calls.append(("text", args, kwargs))
+
+    def count(self, name):
+        """Return how many times the named method was called."""
+        return sum(1 for call_name, _, _ in self.calls if call_name == name)
+
+
 class TestVisualization(unittest.TestCase):
     """Test visualization functions."""
 
-    def setUp(self):
-        """Set up test case."""
-        # Create a temporary directory for test files
-        self.test_dir = tempfile.mkdtemp()
-        self.output_dir = os.path.join(self.test_dir, "output")
-        os.makedirs(self.output_dir, exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        """Create the mock PDF, output directory and saved data shared by all tests."""
+        cls.test_dir = tempfile.mkdtemp()
 
-        # Create mock data
-        self.mock_pdf_path = os.path.join(self.test_dir, "test.pdf")
-        with open(self.mock_pdf_path, 'w') as f:
+        # Placeholder PDF; visualize_template only receives its path
+        cls.mock_pdf_path = os.path.join(cls.test_dir, "test.pdf")
+        with open(cls.mock_pdf_path, 'w') as f:
             f.write("Mock PDF content")
 
+        cls.output_dir = os.path.join(cls.test_dir, "output")
+        os.makedirs(cls.output_dir, exist_ok=True)
+
+        # Saved checkbox visualization metadata for the loader tests
+        cls.processed_dir = os.path.join(cls.test_dir, "processed")
+        vis_dir = os.path.join(cls.processed_dir, "visualizations", "saved_vis_id")
+        os.makedirs(vis_dir, exist_ok=True)
+        with open(os.path.join(vis_dir, "checkbox_visualization_data.json"), 'w') as f:
+            json.dump({"document_name": "saved.pdf", "checkboxes": [{"id": "cb1", "value": True}]}, f)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temp directory."""
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Set up test case."""
+        # Create mock data
         self.mock_template_data = {
             "fields": [
                 {
@@ -80,11 +113,6 @@ class TestVisualization(unittest.TestCase):
             }
         ]
 
-    def tearDown(self):
-        """Clean up after test case."""
-        # Remove the temporary directory
-        shutil.rmtree(self.test_dir)
-
     @patch('src.visualization.convert_from_path')
     @patch('src.visualization.Image')
     @patch('src.visualization.ImageDraw')
@@ -95,9 +123,9 @@ class TestVisualization(unittest.TestCase):
         mock_page.size = (600, 800)
         mock_convert.return_value = [mock_page]
 
-        # Mock the drawing
-        mock_draw_instance = MagicMock()
-        mock_draw.Draw.return_value = mock_draw_instance
+        # Record the drawing
+        draw = _DrawRecorder()
+        mock_draw.Draw.return_value = draw
 
         # Call the function
         result = visualize_template(self.mock_pdf_path, self.mock_template_data, self.output_dir)
@@ -106,8 +134,8 @@ class TestVisualization(unittest.TestCase):
         self.assertEqual(len(result), 1)  # Should have 1 page
         self.assertTrue(mock_convert.called)
         self.assertTrue(mock_draw.Draw.called)
-        self.assertTrue(mock_draw_instance.rectangle.called)
-        self.assertTrue(mock_draw_instance.text.called)
+        self.assertEqual(draw.count("rectangle"), 2)  # One box per field
+        self.assertTrue(draw.count("text"))
 
     @patch('src.visualization.convert_from_path')
     @patch('src.visualization.Image')
@@ -121,9 +149,9 @@ class TestVisualization(unittest.TestCase):
         mock_page2.size = (600, 800)
         mock_convert.return_value = [mock_page1, mock_page2]
 
-        # Mock the drawing
-        mock_draw_instance = MagicMock()
-        mock_draw.Draw.return_value = mock_draw_instance
+        # Record the drawing
+        draw = _DrawRecorder()
+        mock_draw.Draw.return_value = draw
 
         # Call the function
         result = visualize_checkboxes_with_confidence(
@@ -140,9 +168,10 @@ class TestVisualization(unittest.TestCase):
         self.assertEqual(len(result["checkboxes"]), 3)
         
         # Check confidence categories
-        checkbox_high = next(cb for cb in result["checkboxes"] if cb["id"] == "cb1")
-        checkbox_medium = next(cb for cb in result["checkboxes"] if cb["id"] == "cb2")
-        checkbox_low = next(cb for cb in result["checkboxes"] if cb["id"] == "cb3")
+        by_id = {cb["id"]: cb for cb in result["checkboxes"]}
+        checkbox_high = by_id["cb1"]
+        checkbox_medium = by_id["cb2"]
+        checkbox_low = by_id["cb3"]
         
         self.assertEqual(checkbox_high["confidence_category"], "high")
         self.assertEqual(checkbox_medium["confidence_category"], "medium")
@@ -151,17 +180,17 @@ class TestVisualization(unittest.TestCase):
         # Verify drawing calls
         self.assertTrue(mock_convert.called)
         self.assertTrue(mock_draw.Draw.called)
-        self.assertTrue(mock_draw_instance.rectangle.called)
-        self.assertTrue(mock_draw_instance.text.called)
+        self.assertEqual(draw.count("rectangle"), 3)  # One box per checkbox
+        self.assertTrue(draw.count("text"))
 
     @patch('src.visualization.os.path.exists')
     @patch('src.visualization.open', new_callable=mock_open)
-    @patch('src.visualization.json.load')
-    def test_get_checkbox_visualization_data(self, mock_json_load, mock_file, mock_path_exists):
+    @patch('src.visualization._json_loads')
+    def test_get_checkbox_visualization_data(self, mock_json_loads, mock_file, mock_path_exists):
         """Test getting checkbox visualization data."""
         # Setup mocks
         mock_path_exists.return_value = True
-        mock_json_load.return_value = {
+        mock_json_loads.return_value = {
             "document_name": "test.pdf",
             "checkboxes": self.mock_checkboxes
         }
@@ -174,7 +203,16 @@ class TestVisualization(unittest.TestCase):
         self.assertEqual(len(result["checkboxes"]), 3)
         mock_path_exists.assert_called()
         mock_file.assert_called()
-        mock_json_load.assert_called()
+        mock_json_loads.assert_called()
+
+    def test_get_checkbox_visualization_data_from_file(self):
+        """Test loading checkbox visualization data saved on disk."""
+        with patch('src.config.PROCESSED_FOLDER', self.processed_dir):
+            result = get_checkbox_visualization_data("saved_vis_id")
+            missing = get_checkbox_visualization_data("missing_vis_id")
+        
+        self.assertEqual(result, {"document_name": "saved.pdf", "checkboxes": [{"id": "cb1", "value": True}]})
+        self.assertIsNone(missing)
 
     def test_export_checkbox_data(self):
         """Test exporting checkbox data."""
@@ -5,24 +5,16 @@ template visualization, and data handling.
 """
 
 import os
+import copy
 import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
-import json
-import tempfile
-from datetime import datetime
 
 # Import path setup to handle imports from main project
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from path_setup import BASE_DIR, SRC_DIR
-from test_config import (
-    get_test_resource_path, 
-    get_test_pdf_path, 
-    get_test_template_path,
-    TEST_PDFS_DIR,
-    TEST_TEMPLATES_DIR
-)
+from tests import path_setup
+from tests.test_config import TEST_PDFS_DIR, TEST_TEMPLATES_DIR
+from tests.helpers import SAMPLE_CHECKBOXES
 
 # Import the visualization functions
 try:
@@ -33,91 +25,74 @@ try:
         export_checkbox_data,
         save_checkbox_corrections
     )
+    VIS_AVAILABLE = True
 except ImportError:
-    # Skip tests if visualization module cannot be imported
-    from unittest import skip
-    skip("Visualization module could not be imported")
+    # Tests are skipped below if the visualization module cannot be imported
+    VIS_AVAILABLE = False
 
 
+@unittest.skipUnless(VIS_AVAILABLE, "Visualization module could not be imported")
 class TestVisualizationCore(unittest.TestCase):
     """Test core visualization functions."""
 
-    def setUp(self):
-        """Set up test case."""
-        # Create a temporary directory for test files
-        self.test_dir = tempfile.mkdtemp()
-        self.output_dir = os.path.join(self.test_dir, "output")
-        os.makedirs(self.output_dir, exist_ok=True)
-
-        # Create mock data
-        self.mock_pdf_path = os.path.join(self.test_dir, "test.pdf")
-        with open(self.mock_pdf_path, 'w') as f:
-            f.write("Mock PDF content")
-
-        self.mock_template_data = {
-            "fields": [
-                {
-                    "name": "checkbox1",
-                    "type": "checkbox",
-                    "page": 1,
-                    "value": True,
-                    "bbox": {"left": 0.1, "top": 0.1, "right": 0.2, "bottom": 0.2}
-                },
-                {
-                    "name": "textfield1",
-                    "type": "text",
-                    "page": 1,
-                    "value": "Sample text",
-                    "bbox": {"left": 0.3, "top": 0.3, "right": 0.5, "bottom": 0.4}
-                }
-            ]
-        }
-
-        self.mock_checkboxes = [
+    # Template shared by every test, like SAMPLE_CHECKBOXES. Tests that pass
+    # either to code which mutates it take a deep copy first.
+    _TEMPLATE_DATA = {
+        "fields": [
             {
-                "id": "cb1",
-                "label": "Option 1",
-                "value": True,
-                "confidence": 0.95,
+                "name": "checkbox1",
+                "type": "checkbox",
                 "page": 1,
+                "value": True,
                 "bbox": {"left": 0.1, "top": 0.1, "right": 0.2, "bottom": 0.2}
             },
             {
-                "id": "cb2",
-                "label": "Option 2",
-                "value": False,
-                "confidence": 0.8,
+                "name": "textfield1",
+                "type": "text",
                 "page": 1,
-                "bbox": {"left": 0.1, "top": 0.3, "right": 0.2, "bottom": 0.4}
-            },
-            {
-                "id": "cb3",
-                "label": "Option 3",
-                "value": True,
-                "confidence": 0.6,
-                "page": 2,
-                "bbox": {"left": 0.1, "top": 0.1, "right": 0.2, "bottom": 0.2}
+                "value": "Sample text",
+                "bbox": {"left": 0.3, "top": 0.3, "right": 0.5, "bottom": 0.4}
             }
         ]
+    }
 
-    def tearDown(self):
-        """Clean up after test case."""
-        # Remove the temporary directory
-        shutil.rmtree(self.test_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Create the temp directory shared by all tests."""
+        cls.test_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temp directory."""
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Set up test case."""
+        self.mock_template_data = self._TEMPLATE_DATA
+        self.mock_checkboxes = SAMPLE_CHECKBOXES
+
+    def _use_test_paths(self):
+        """Point the test at its own paths under the class temp dir."""
+        test_dir = os.path.join(self.test_dir, self._testMethodName)
+        # The visualize_* functions create the output dir themselves
+        self.output_dir = os.path.join(test_dir, "output")
+        # Never opened: convert_from_path is mocked in every test using it
+        self.mock_pdf_path = os.path.join(test_dir, "test.pdf")
 
     def test_test_data_paths_exist(self):
         """Verify that the test data directories and files exist."""
-        # Check if test directories exist
-        self.assertTrue(os.path.exists(TEST_PDFS_DIR), f"Test PDFs directory not found: {TEST_PDFS_DIR}")
-        self.assertTrue(os.path.exists(TEST_TEMPLATES_DIR), f"Test templates directory not found: {TEST_TEMPLATES_DIR}")
-        
-        # Check for a test PDF
-        test_pdf = get_test_pdf_path("test_visualization_form.pdf")
-        self.assertTrue(os.path.exists(test_pdf), f"Test PDF not found: {test_pdf}")
-        
-        # Check for a test template
-        test_template = get_test_template_path("test_visualization_template.json")
-        self.assertTrue(os.path.exists(test_template), f"Test template not found: {test_template}")
+        # One listing per data directory checks both the directory and its file
+        expected = (
+            ("PDF", TEST_PDFS_DIR, "test_visualization_form.pdf"),
+            ("template", TEST_TEMPLATES_DIR, "test_visualization_template.json"),
+        )
+        for kind, data_dir, filename in expected:
+            try:
+                with os.scandir(data_dir) as entries:
+                    names = {entry.name for entry in entries}
+            except FileNotFoundError:
+                self.fail(f"Test {kind}s directory not found: {data_dir}")
+            self.assertIn(filename, names, f"Test {kind} not found: {os.path.join(data_dir, filename)}")
 
     @patch('src.visualization.convert_from_path')
     @patch('src.visualization.Image')
@@ -134,6 +109,7 @@ class TestVisualizationCore(unittest.TestCase):
         mock_draw.Draw.return_value = mock_draw_instance
 
         # Call the function
+        self._use_test_paths()
         result = visualize_template(self.mock_pdf_path, self.mock_template_data, self.output_dir)
 
         # Verify results
@@ -159,10 +135,11 @@ class TestVisualizationCore(unittest.TestCase):
         mock_draw_instance = MagicMock()
         mock_draw.Draw.return_value = mock_draw_instance
 
-        # Call the function
+        # Call the function; it tags the checkboxes in place
+        self._use_test_paths()
         result = visualize_checkboxes_with_confidence(
             self.mock_pdf_path, 
-            self.mock_checkboxes,
+            copy.deepcopy(self.mock_checkboxes),
             self.output_dir,
             0.9,
             0.7
@@ -174,9 +151,10 @@ class TestVisualizationCore(unittest.TestCase):
         self.assertEqual(len(result["checkboxes"]), 3)
         
         # Check confidence categories
-        checkbox_high = next(cb for cb in result["checkboxes"] if cb["id"] == "cb1")
-        checkbox_medium = next(cb for cb in result["checkboxes"] if cb["id"] == "cb2")
-        checkbox_low = next(cb for cb in result["checkboxes"] if cb["id"] == "cb3")
+        by_id = {cb["id"]: cb for cb in result["checkboxes"]}
+        checkbox_high = by_id["cb1"]
+        checkbox_medium = by_id["cb2"]
+        checkbox_low = by_id["cb3"]
         
         self.assertEqual(checkbox_high["confidence_category"], "high")
         self.assertEqual(checkbox_medium["confidence_category"], "medium")
@@ -190,12 +168,12 @@ class TestVisualizationCore(unittest.TestCase):
 
     @patch('src.visualization.os.path.exists')
     @patch('src.visualization.open', new_callable=mock_open)
-    @patch('src.visualization.json.load')
-    def test_get_checkbox_visualization_data(self, mock_json_load, mock_file, mock_path_exists):
+    @patch('src.visualization._json_loads')
+    def test_get_checkbox_visualization_data(self, mock_json_loads, mock_file, mock_path_exists):
         """Test getting checkbox visualization data."""
         # Setup mocks
         mock_path_exists.return_value = True
-        mock_json_load.return_value = {
+        mock_json_loads.return_value = {
             "document_name": "test.pdf",
             "checkboxes": self.mock_checkboxes
         }
@@ -208,7 +186,7 @@ class TestVisualizationCore(unittest.TestCase):
         self.assertEqual(len(result["checkboxes"]), 3)
         mock_path_exists.assert_called()
         mock_file.assert_called()
-        mock_json_load.assert_called()
+        mock_json_loads.assert_called()
 
     def test_export_checkbox_data(self):
         """Test exporting checkbox data."""
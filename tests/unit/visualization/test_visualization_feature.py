@@ -2,20 +2,26 @@
 """
 Test script for the PDF field visualization feature.
 This script performs a series of tests to ensure that the visualization features work correctly.
+
+Run it from the project root as a module:
+    python -m tests.unit.visualization.test_visualization_feature
 """
 
 import os
 import json
 import sys
+import functools
 import shutil
 import logging
 import unittest
 from datetime import datetime
 
-# Add the project root directory to the path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Now we can import from tests
+from tests.path_setup import BASE_DIR
 from tests.test_config import TEST_TEMPLATES_DIR, TEST_PDFS_DIR, get_test_template_path, get_test_pdf_path
 
 # Set up logging
@@ -25,17 +31,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Get BASE_DIR
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../'))
+@functools.lru_cache(maxsize=None)
+def _load_template(template_path):
+    """
+    Parse a template file once per run; callers must not modify the result
+    
+    Args:
+        template_path (str): Path to the template JSON file
+        
+    Returns:
+        dict: Parsed template
+    """
+    with open(template_path, 'rb') as f:
+        data = f.read()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 class TestVisualizationFeature(unittest.TestCase):
     """Test case for visualization feature."""
     
-    def setUp(self):
-        """Set up test environment."""
-        self.check_directories()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once for all tests."""
+        cls.check_directories()
     
-    def check_directories(self):
+    @classmethod
+    def check_directories(cls):
         """Check if required directories exist."""
         required_dirs = [
             TEST_TEMPLATES_DIR,
@@ -44,17 +65,16 @@ class TestVisualizationFeature(unittest.TestCase):
             os.path.join(BASE_DIR, "static/visualizations")
         ]
         
-        missing_dirs = []
+        # Try to create each directory straight away: one mkdir call covers
+        # both the check and the creation, without a stat-then-create race
         for directory in required_dirs:
-            if not os.path.exists(directory):
-                missing_dirs.append(directory)
-        
-        if missing_dirs:
-            logger.error(f"Missing directories: {', '.join(missing_dirs)}")
-            logger.info("Creating missing directories...")
-            for directory in missing_dirs:
+            try:
+                os.mkdir(directory)
+            except FileExistsError:
+                continue
+            except FileNotFoundError:
                 os.makedirs(directory, exist_ok=True)
-                logger.info(f"Created directory: {directory}")
+            logger.info(f"Created missing directory: {directory}")
     
     def test_template_exists(self):
         """Test if template exists and is valid."""
@@ -63,8 +83,7 @@ class TestVisualizationFeature(unittest.TestCase):
         
         # Check if template is valid JSON
         try:
-            with open(template_path, 'r') as f:
-                template = json.load(f)
+            template = _load_template(template_path)
             self.assertIsInstance(template, dict)
             self.assertIn('fields', template)
         except json.JSONDecodeError:
@@ -83,9 +102,13 @@ class TestVisualizationFeature(unittest.TestCase):
             "error-placeholder.png"
         ]
         
+        # One directory listing instead of a stat per placeholder
+        with os.scandir(placeholder_dir) as entries:
+            present = {entry.name for entry in entries}
+        
         for placeholder in required_placeholders:
-            placeholder_path = os.path.join(placeholder_dir, placeholder)
-            self.assertTrue(os.path.exists(placeholder_path), f"Placeholder image not found: {placeholder_path}")
+            self.assertIn(placeholder, present,
+                          f"Placeholder image not found: {os.path.join(placeholder_dir, placeholder)}")
     
     def test_create_visualization(self):
         """Test creating a visualization."""
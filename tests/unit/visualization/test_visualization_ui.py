@@ -5,28 +5,14 @@ This module covers the UI components and templates for both field and checkbox v
 
 import unittest
 import os
-import json
-import tempfile
-import shutil
-from flask import Flask, template_rendered, jsonify
-from contextlib import contextmanager
-from flask import appcontext_pushed, g
-from unittest.mock import patch, MagicMock
-import pytest
+import importlib.util
 
-# Import path setup to handle imports from main project
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from path_setup import BASE_DIR, SRC_DIR
-from test_config import get_test_resource_path, get_test_pdf_path, get_test_template_path
+from tests.path_setup import BASE_DIR, SRC_DIR
+from tests.test_config import get_test_resource_path, get_test_pdf_path, get_test_template_path
 
-# Import Flask app if available
-try:
-    from src import app as flask_app
-except ImportError:
-    # Skip tests if modules cannot be imported
-    from unittest import skip
-    skip("Flask app could not be imported")
+# Flask is only imported once a UI test class actually runs, so collecting
+# or deselecting these tests doesn't pay for it
+FLASK_AVAILABLE = importlib.util.find_spec("flask") is not None
 
 # Sample field data for testing
 SAMPLE_FIELDS = [
@@ -58,6 +44,9 @@ SAMPLE_FIELDS = [
     }
 ]
 
+# Field type counts for SAMPLE_FIELDS, as reported by the field visualization API
+EXPECTED_FIELD_TYPES = {"checkbox": 2}
+
 # Sample checkbox data for testing
 SAMPLE_CHECKBOXES = [
     {
@@ -79,78 +68,119 @@ SAMPLE_CHECKBOXES = [
 ]
 
 
+# Static parts of the test API responses, serialized once per class with
+# _DOC_ID_SLOT standing in for the requested document ID
+_DOC_ID_SLOT = "__DOC_ID__"
+
+_FIELD_RESPONSE_TEMPLATE = {
+    "document_name": "Test Form",
+    "processing_date": "2023-11-30T12:00:00Z",
+    "total_pages": 1,
+    "pages": [
+        {
+            "page_number": 1,
+            "image_url": "/test/pages/page_1.png",
+            "width": 600,
+            "height": 800
+        }
+    ],
+    "fields": SAMPLE_FIELDS,
+    "field_types": EXPECTED_FIELD_TYPES
+}
+
+_CHECKBOX_RESPONSE_TEMPLATE = {
+    "document_name": "Test Checkbox Form",
+    "processing_date": "2023-11-30T12:00:00Z",
+    "total_pages": 1,
+    "pages": [
+        {
+            "page_number": 1,
+            "image_url": "/test/pages/checkbox_page_1.png",
+            "width": 600,
+            "height": 800
+        }
+    ],
+    "checkboxes": SAMPLE_CHECKBOXES
+}
+
+
+@unittest.skipUnless(FLASK_AVAILABLE, "Flask is not installed")
 class TestVisualizationUI(unittest.TestCase):
     """Base class for visualization UI tests."""
     
-    def setUp(self):
-        """Set up test environment."""
+    @classmethod
+    def setUpClass(cls):
+        """Build the test app once for the class; subclasses add their routes."""
+        from flask import Flask
+        from tests.helpers import OrjsonProvider
+        
         # Create Flask test app
-        self.app = Flask(__name__,
-                         template_folder=os.path.join(SRC_DIR, 'templates'),
-                         static_folder=os.path.join(SRC_DIR, 'static'))
-        self.app.testing = True
-        self.client = self.app.test_client()
+        cls.app = Flask(__name__,
+                        template_folder=os.path.join(SRC_DIR, 'templates'),
+                        static_folder=os.path.join(SRC_DIR, 'static'))
+        cls.app.testing = True
+        cls.app.json = OrjsonProvider(cls.app)
+    
+    @classmethod
+    def _json_route_body(cls, template):
+        """
+        Serialize a response template once, leaving a slot for the document ID
+        
+        Args:
+            template (dict): Static part of the response
+            
+        Returns:
+            function: Builds the response for a given document ID
+        """
+        from flask import Response
+        
+        dumps = cls.app.json.dumps
+        head, tail = dumps({**template, "document_id": _DOC_ID_SLOT}).split(dumps(_DOC_ID_SLOT))
         
-        # Create a temporary directory for test files
-        self.temp_dir = tempfile.mkdtemp()
+        def respond(document_id):
+            return Response(head + dumps(document_id) + tail, mimetype='application/json')
         
-    def tearDown(self):
-        """Clean up after tests."""
-        # Remove temporary directory
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        return respond
+    
+    def setUp(self):
+        """Create a test client."""
+        self.client = self.app.test_client()
 
 
 class TestFieldVisualizationUI(TestVisualizationUI):
     """Test cases for field overlay visualization UI."""
     
-    def setUp(self):
-        """Set up test case with field-specific fixtures."""
-        super().setUp()
-        
-        # Test document details
-        self.test_document_id = "test_doc_123"
-        self.pdf_path = get_test_pdf_path("test_form.pdf")
+    @classmethod
+    def setUpClass(cls):
+        """Register the field visualization routes once for the class."""
+        # Check for the test PDF before building anything, and skip the
+        # whole class at once if it is missing
+        cls.pdf_path = get_test_pdf_path("test_form.pdf")
+        if not os.path.exists(cls.pdf_path):
+            raise unittest.SkipTest(f"Test PDF file not found: {cls.pdf_path}")
         
-        # Check if test PDF exists, skip test if not
-        if not os.path.exists(self.pdf_path):
-            pytest.skip(f"Test PDF file not found: {self.pdf_path}")
+        super().setUpClass()
+        app = cls.app
         
         # Set up routes for testing
-        @self.app.route('/ui/field-visualization/<document_id>')
+        @app.route('/ui/field-visualization/<document_id>')
         def field_visualization_ui(document_id):
             """Serve the field visualization template."""
-            return self.app.send_static_file('field_visualization.html')
+            return app.send_static_file('field_visualization.html')
+        
+        respond = cls._json_route_body(_FIELD_RESPONSE_TEMPLATE)
         
-        @self.app.route('/api/field-visualization/<document_id>')
+        @app.route('/api/field-visualization/<document_id>')
         def get_field_visualization_data(document_id):
             """API endpoint to get field extraction visualization data."""
-            # Return field visualization data
-            page_data = [
-                {
-                    "page_number": 1,
-                    "image_url": f"/test/pages/page_1.png",
-                    "width": 600,
-                    "height": 800
-                }
-            ]
-            
-            # Count fields by type
-            field_types = {}
-            for field in SAMPLE_FIELDS:
-                field_type = field.get("type", "other")
-                field_types[field_type] = field_types.get(field_type, 0) + 1
-            
-            # Return full visualization data
-            return jsonify({
-                "document_id": document_id,
-                "document_name": "Test Form",
-                "processing_date": "2023-11-30T12:00:00Z",
-                "total_pages": 1,
-                "pages": page_data,
-                "fields": SAMPLE_FIELDS,
-                "field_types": field_types
-            })
+            return respond(document_id)
+    
+    def setUp(self):
+        """Set up test case with field-specific fixtures."""
+        super().setUp()
+        
+        # Test document details
+        self.test_document_id = "test_doc_123"
     
     def test_field_visualization_endpoint(self):
         """Test the field visualization API endpoint."""
@@ -158,66 +188,52 @@ class TestFieldVisualizationUI(TestVisualizationUI):
         self.assertEqual(response.status_code, 200)
         
         # Verify response data
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['document_id'], self.test_document_id)
         self.assertIn('fields', data)
         self.assertIn('pages', data)
-        self.assertIn('field_types', data)
         
         # Verify field data
         self.assertEqual(len(data['fields']), len(SAMPLE_FIELDS))
-        
-        # Verify field types
-        self.assertIn('checkbox', data['field_types'])
-        self.assertEqual(data['field_types']['checkbox'], 2)
+        self.assertEqual(data['field_types'], EXPECTED_FIELD_TYPES)
     
     def test_field_ui_endpoint(self):
         """Test the field visualization UI endpoint."""
         # Skip if static files are not available
         response = self.client.get(f'/ui/field-visualization/{self.test_document_id}')
         if response.status_code != 200:
-            pytest.skip("Field visualization UI template not found in test environment.")
+            self.skipTest("Field visualization UI template not found in test environment.")
         self.assertEqual(response.status_code, 200)
 
 
 class TestCheckboxVisualizationUI(TestVisualizationUI):
     """Test cases for checkbox visualization UI."""
     
-    def setUp(self):
-        """Set up test case with checkbox-specific fixtures."""
-        super().setUp()
-        
-        # Test document details
-        self.test_document_id = "test_cb_doc_123"
+    @classmethod
+    def setUpClass(cls):
+        """Register the checkbox visualization routes once for the class."""
+        super().setUpClass()
+        app = cls.app
         
         # Set up routes for testing
-        @self.app.route('/ui/checkbox-visualization/<document_id>')
+        @app.route('/ui/checkbox-visualization/<document_id>')
         def checkbox_visualization_ui(document_id):
             """Serve the checkbox visualization template."""
-            return self.app.send_static_file('checkbox_visualization.html')
+            return app.send_static_file('checkbox_visualization.html')
+        
+        respond = cls._json_route_body(_CHECKBOX_RESPONSE_TEMPLATE)
         
-        @self.app.route('/api/visualization/<document_id>')
+        @app.route('/api/visualization/<document_id>')
         def get_checkbox_visualization_data(document_id):
             """API endpoint to get checkbox visualization data."""
-            # Return checkbox visualization data
-            page_data = [
-                {
-                    "page_number": 1,
-                    "image_url": f"/test/pages/checkbox_page_1.png",
-                    "width": 600,
-                    "height": 800
-                }
-            ]
-            
-            # Return full visualization data
-            return jsonify({
-                "document_id": document_id,
-                "document_name": "Test Checkbox Form",
-                "processing_date": "2023-11-30T12:00:00Z",
-                "total_pages": 1,
-                "pages": page_data,
-                "checkboxes": SAMPLE_CHECKBOXES
-            })
+            return respond(document_id)
+    
+    def setUp(self):
+        """Set up test case with checkbox-specific fixtures."""
+        super().setUp()
+        
+        # Test document details
+        self.test_document_id = "test_cb_doc_123"
     
     def test_checkbox_visualization_endpoint(self):
         """Test the checkbox visualization API endpoint."""
@@ -225,7 +241,7 @@ class TestCheckboxVisualizationUI(TestVisualizationUI):
         self.assertEqual(response.status_code, 200)
         
         # Verify response data
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['document_name'], "Test Checkbox Form")
         self.assertIn('checkboxes', data)
         self.assertIn('pages', data)
@@ -238,7 +254,7 @@ class TestCheckboxVisualizationUI(TestVisualizationUI):
         # Skip if static files are not available
         response = self.client.get(f'/ui/checkbox-visualization/{self.test_document_id}')
         if response.status_code != 200:
-            pytest.skip("Checkbox visualization UI template not found in test environment.")
+            self.skipTest("Checkbox visualization UI template not found in test environment.")
         self.assertEqual(response.status_code, 200)
 
 
@@ -247,30 +263,27 @@ class TestVisualizationAssets(unittest.TestCase):
     
     def test_static_assets_exist(self):
         """Test if required static assets exist."""
-        # Check if test data paths exist
-        test_paths = [
-            # Skip if test directories don't exist
-            os.path.join(BASE_DIR, "static/images"),
-            os.path.join(BASE_DIR, "static/visualizations")
-        ]
+        # One listing of static/ and one of static/images cover every check
+        static_dir = os.path.join(BASE_DIR, "static")
+        try:
+            with os.scandir(static_dir) as entries:
+                static_subdirs = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            static_subdirs = set()
         
-        for path in test_paths:
-            if not os.path.exists(path):
+        for name in ("images", "visualizations"):
+            if name not in static_subdirs:
                 # Don't fail, just skip
-                pytest.skip(f"Required static path not found: {path}")
+                self.skipTest(f"Required static path not found: {os.path.join(static_dir, name)}")
         
         # Check for placeholder images
-        placeholder_dir = os.path.join(BASE_DIR, "static/images")
-        if os.path.exists(placeholder_dir):
-            placeholders = [
-                "loading-placeholder.png",
-                "error-placeholder.png"
-            ]
-            
-            for placeholder in placeholders:
-                placeholder_path = os.path.join(placeholder_dir, placeholder)
-                if not os.path.exists(placeholder_path):
-                    pytest.skip(f"Placeholder image not found: {placeholder_path}")
+        placeholder_dir = os.path.join(static_dir, "images")
+        with os.scandir(placeholder_dir) as entries:
+            present = {entry.name for entry in entries}
+        
+        for placeholder in ("loading-placeholder.png", "error-placeholder.png"):
+            if placeholder not in present:
+                self.skipTest(f"Placeholder image not found: {os.path.join(placeholder_dir, placeholder)}")
 
 
 if __name__ == '__main__':
@@ -7,50 +7,81 @@ affect field visualization.
 import sys
 import json
 import os
+import functools
 from typing import Dict, Any, List
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Key sets of the two supported bbox formats
+LTRB_KEYS = frozenset(("left", "top", "right", "bottom"))
+LTWH_KEYS = frozenset(("left", "top", "width", "height"))
+NORMALIZED_KEYS = LTRB_KEYS | LTWH_KEYS
+
+# Stop checking a template once this many issues have been found
+MAX_ISSUES = 100
+
+def _field_name(field: Dict[str, Any], default: Any) -> str:
+    """Return the field's name for an issue message, only looked up when needed."""
+    return field["name"] if "name" in field else str(default)
+
 def check_bbox_format(field: Dict[str, Any]) -> List[str]:
-    """Check if the field's bbox has a valid format."""
+    """
+    Check if the field's bbox has a valid format.
+
+    Stops at the first structural problem (missing, empty, unknown format or
+    non-numeric values), since the later checks would only repeat it.
+    """
     issues = []
     if "bbox" not in field:
-        issues.append(f"Field '{field.get('name', 'unknown')}' has no bbox")
+        issues.append(f"Field '{_field_name(field, 'unknown')}' has no bbox")
         return issues
     
-    bbox = field.get("bbox", {})
+    bbox = field["bbox"]
     if not bbox:
-        issues.append(f"Field '{field.get('name', 'unknown')}' has empty bbox")
+        issues.append(f"Field '{_field_name(field, 'unknown')}' has empty bbox")
         return issues
     
-    # Check if using left/top/right/bottom format
-    ltrb_format = all(key in bbox for key in ["left", "top", "right", "bottom"])
-    # Check if using left/top/width/height format
-    ltwh_format = all(key in bbox for key in ["left", "top", "width", "height"])
+    # Check which format the bbox uses: left/top/right/bottom or left/top/width/height
+    keys = bbox.keys()
+    ltrb_format = keys >= LTRB_KEYS
+    ltwh_format = keys >= LTWH_KEYS
     
     if not ltrb_format and not ltwh_format:
-        issues.append(f"Field '{field.get('name', 'unknown')}' has invalid bbox format: {bbox}")
+        issues.append(f"Field '{_field_name(field, 'unknown')}' has invalid bbox format: {bbox}")
+        return issues
     
     # Check for invalid values
     for key, value in bbox.items():
         if not isinstance(value, (int, float)):
-            issues.append(f"Field '{field.get('name', 'unknown')}' has non-numeric bbox value for {key}: {value}")
-        elif value < 0:
-            issues.append(f"Field '{field.get('name', 'unknown')}' has negative bbox value for {key}: {value}")
-        elif key in ["left", "top", "right", "bottom", "width", "height"] and value > 1.0:
-            issues.append(f"Field '{field.get('name', 'unknown')}' has non-normalized bbox value for {key}: {value}")
+            issues.append(f"Field '{_field_name(field, 'unknown')}' has non-numeric bbox value for {key}: {value}")
+            return issues
+        if value < 0:
+            issues.append(f"Field '{_field_name(field, 'unknown')}' has negative bbox value for {key}: {value}")
+        elif value > 1.0 and key in NORMALIZED_KEYS:
+            issues.append(f"Field '{_field_name(field, 'unknown')}' has non-normalized bbox value for {key}: {value}")
     
     # Check if bbox is valid (right > left, bottom > top)
     if ltrb_format:
-        if bbox.get("right", 1) <= bbox.get("left", 0):
-            issues.append(f"Field '{field.get('name', 'unknown')}' has invalid bbox: right <= left")
-        if bbox.get("bottom", 1) <= bbox.get("top", 0):
-            issues.append(f"Field '{field.get('name', 'unknown')}' has invalid bbox: bottom <= top")
+        if bbox["right"] <= bbox["left"]:
+            issues.append(f"Field '{_field_name(field, 'unknown')}' has invalid bbox: right <= left")
+        if bbox["bottom"] <= bbox["top"]:
+            issues.append(f"Field '{_field_name(field, 'unknown')}' has invalid bbox: bottom <= top")
     
     # Check if width/height are valid
     if ltwh_format:
-        if bbox.get("width", 1) <= 0:
-            issues.append(f"Field '{field.get('name', 'unknown')}' has invalid bbox: width <= 0")
-        if bbox.get("height", 1) <= 0:
-            issues.append(f"Field '{field.get('name', 'unknown')}' has invalid bbox: height <= 0")
+        if bbox["width"] <= 0:
+            issues.append(f"Field '{_field_name(field, 'unknown')}' has invalid bbox: width <= 0")
+        if bbox["height"] <= 0:
+            issues.append(f"Field '{_field_name(field, 'unknown')}' has invalid bbox: height <= 0")
     
     return issues
 
@@ -66,28 +97,52 @@ def check_template_fields(template_data: Dict[str, Any]) -> List[str]:
     
     print(f"Checking {len(fields)} fields in template")
     
-    # Check each field
+    # Check each field in a single pass; names are only looked up for issues
     for i, field in enumerate(fields):
         if "name" not in field:
             issues.append(f"Field #{i} has no name")
         
         if "type" not in field:
-            issues.append(f"Field '{field.get('name', f'#{i}')}' has no type")
+            issues.append(f"Field '{_field_name(field, f'#{i}')}' has no type")
         
         if "page" not in field:
-            issues.append(f"Field '{field.get('name', f'#{i}')}' has no page number")
+            issues.append(f"Field '{_field_name(field, f'#{i}')}' has no page number")
         
         # Check bbox format
-        bbox_issues = check_bbox_format(field)
-        issues.extend(bbox_issues)
+        issues.extend(check_bbox_format(field))
         
         # Check if required fields are present based on type
-        field_type = field.get("type", "unknown")
-        if field_type == "checkbox" and "value" not in field:
-            issues.append(f"Checkbox field '{field.get('name', f'#{i}')}' has no value")
+        if field.get("type") == "checkbox" and "value" not in field:
+            issues.append(f"Checkbox field '{_field_name(field, f'#{i}')}' has no value")
+        
+        if len(issues) >= MAX_ISSUES:
+            del issues[MAX_ISSUES:]
+            issues.append(f"Stopped after {MAX_ISSUES} issues at field #{i} of {len(fields)}")
+            break
     
     return issues
 
+@functools.lru_cache(maxsize=None)
+def _uploaded_files(uploads_dir: str = "uploads") -> frozenset:
+    """List the uploads directory once, so each form check is a set lookup."""
+    try:
+        with os.scandir(uploads_dir) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+
+def _upload_exists(stored_filename: str, uploads_dir: str = "uploads") -> bool:
+    """
+    Check if a stored file exists in the uploads directory.
+    
+    Plain file names are looked up in the cached directory listing. Empty
+    names, dot names and paths with separators go through os.path.exists.
+    """
+    if (stored_filename not in ("", ".", "..") and os.sep not in stored_filename
+            and not (os.altsep and os.altsep in stored_filename)):
+        return stored_filename in _uploaded_files(uploads_dir)
+    return os.path.exists(os.path.join(uploads_dir, stored_filename))
+
 def check_form_data(form_data: Dict[str, Any]) -> List[str]:
     """Check form data for issues."""
     issues = []
@@ -107,7 +162,7 @@ def check_form_data(form_data: Dict[str, Any]) -> List[str]:
     else:
         # Check if the file exists
         stored_filename = document_data.get("stored_filename", "")
-        if not os.path.exists(os.path.join("uploads", stored_filename)):
+        if not _upload_exists(stored_filename):
             issues.append(f"Document file not found at uploads/{stored_filename}")
     
     return issues
@@ -120,8 +175,8 @@ def main():
     input_file = sys.argv[1]
     
     try:
-        with open(input_file, "r") as f:
-            data = json.load(f)
+        with open(input_file, "rb") as f:
+            data = _json_loads(f.read())
         
         # Determine if this is a template or form file
         if "fields" in data:
@@ -135,9 +190,10 @@ def main():
             sys.exit(1)
         
         if issues:
-            print(f"\n⚠️ Found {len(issues)} issues:")
-            for i, issue in enumerate(issues, 1):
-                print(f"{i}. {issue}")
+            # Write the report in one call rather than one print per issue
+            lines = [f"\n⚠️ Found {len(issues)} issues:"]
+            lines.extend(f"{i}. {issue}" for i, issue in enumerate(issues, 1))
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("✅ No issues found!")
             
@@ -1,24 +1,33 @@
 from PIL import Image, ImageDraw, ImageFont
+import functools
 import os
 
+@functools.lru_cache(maxsize=4)
+def _font(name="Arial", size=36):
+    """Load a font once, default to a built-in one if not available."""
+    try:
+        return ImageFont.truetype(name, size)
+    except IOError:
+        return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=None)
+def _text_size(text, font):
+    """Measure text once per (text, font) pair."""
+    bbox = font.getbbox(text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
 def create_placeholder_image(filename, text, color, size=(800, 1000)):
     """Create a placeholder image with text."""
     # Create a new image with the specified background color
     image = Image.new('RGB', size, color)
     draw = ImageDraw.Draw(image)
     
-    # Try to load a font, default to a built-in one if not available
-    try:
-        font = ImageFont.truetype("Arial", 36)
-    except IOError:
-        font = ImageFont.load_default()
+    font = _font()
     
     # Calculate text position for centering
     try:
         # Modern way - PIL 8.0.0+
-        bbox = font.getbbox(text)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = _text_size(text, font)
     except AttributeError:
         # Fallback for older PIL versions
         text_width, text_height = draw.textsize(text, font=font)
@@ -30,7 +39,8 @@ def create_placeholder_image(filename, text, color, size=(800, 1000)):
     
     # Save the image
     filepath = os.path.join("static", "images", filename)
-    image.save(filepath)
+    # Solid fills compress well even at the fastest zlib level
+    image.save(filepath, format='PNG', optimize=False, compress_level=1)
     print(f"Created placeholder image: {filepath}")
 
 def main():